@@ -1,6 +1,10 @@
 """Core Discord bot implementation."""
 
+import atexit
 import logging
+import logging.handlers
+import queue
+from typing import List
 
 import discord
 import ollama
@@ -20,12 +24,28 @@ from tools import tool_registry
 from user_management import UserManager
 from utils.discord_utils import get_channel_name
 
-# Set up logging
+# Set up logging. Records are handed to a queue and written to the file and
+# console by a listener thread, so log I/O never blocks the event loop.
+log_formatter = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+log_handlers: List[logging.Handler] = [
+    logging.FileHandler("bot.log"),
+    logging.StreamHandler(),
+]
+for log_handler in log_handlers:
+    log_handler.setFormatter(log_formatter)
+log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
 logging.basicConfig(
     level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("bot.log"), logging.StreamHandler()],
+    handlers=[logging.handlers.QueueHandler(log_queue)],
 )
+# bot.run() used to set this when it installed its own handler; keep the
+# library's gateway chatter out of the debug log as before
+logging.getLogger("discord").setLevel(logging.INFO)
 logger = logging.getLogger("deepbot")
 
 
@@ -265,6 +285,22 @@ class DeepBot(commands.Bot):
             logger.error(f"Error queueing response: {str(e)}")
             await message.reply(f"-# Sorry, I encountered an error: {str(e)}")
 
+    async def on_raw_message_delete(
+        self, payload: discord.RawMessageDeleteEvent
+    ) -> None:
+        """Event triggered when a message is deleted, cached or not."""
+        self.irc_bot.handle_message_delete(payload.channel_id, {payload.message_id})
+
+    async def on_raw_bulk_message_delete(
+        self, payload: discord.RawBulkMessageDeleteEvent
+    ) -> None:
+        """Event triggered when messages are deleted in bulk, cached or not."""
+        self.irc_bot.handle_message_delete(payload.channel_id, payload.message_ids)
+
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
+        """Event triggered when a message is edited, cached or not."""
+        self.irc_bot.handle_message_edit(payload.message)
+
     async def on_reaction_add(
         self, reaction: discord.Reaction, user: discord.User
     ) -> None:
@@ -287,7 +323,9 @@ def run_bot() -> None:
     token = config.DISCORD_TOKEN
     if token is None:
         raise ValueError("DISCORD_TOKEN is not set in config")
-    bot.run(token)
+    # Logging is configured above; stop discord.py adding its own blocking
+    # handler to the "discord" logger, which duplicated every library line
+    bot.run(token, log_handler=None)
 
 
 if __name__ == "__main__":
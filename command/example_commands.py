@@ -121,8 +121,9 @@ class ExampleCommands:
                 await ctx.send("-# Both user and bot messages must not be empty")
                 return
 
-            pairs = example_conversation.add_pair(user_msg, bot_msg)
-            await ctx.send(f"-# Added new message pair #{len(pairs)}:")
+            example_conversation.add_pair(user_msg, bot_msg)
+            count = example_conversation.count_pairs()
+            await ctx.send(f"-# Added new message pair #{count}:")
             await ctx.send(f"-# User: {user_msg}\n-# Bot: {bot_msg}")
 
         except Exception as e:
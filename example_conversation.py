@@ -1,16 +1,20 @@
 """Example conversation management for DeepBot."""
 
-import json
 import logging
+import os
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
+import orjson
 from ollama import Message as LLMMessage
 
 from tools import tool_registry
 
-# File to store the example conversation
-EXAMPLE_CONVERSATION_FILE = "example_conversation.json"
+# File to store the example conversation, one JSON-encoded pair per line
+EXAMPLE_CONVERSATION_FILE = "example_conversation.jsonl"
+
+# Previous single-array JSON file, converted on first use
+LEGACY_EXAMPLE_CONVERSATION_FILE = "example_conversation.json"
 
 logger = logging.getLogger("deepbot")
 
@@ -23,55 +27,73 @@ class MessagePair:
     assistant: str
 
 
+def _migrate_legacy_file() -> None:
+    """Convert the legacy JSON array file to JSON lines if needed."""
+    if os.path.exists(EXAMPLE_CONVERSATION_FILE) or not os.path.exists(
+        LEGACY_EXAMPLE_CONVERSATION_FILE
+    ):
+        return
+
+    with open(LEGACY_EXAMPLE_CONVERSATION_FILE, "rb") as f:
+        pairs = [MessagePair(**pair) for pair in orjson.loads(f.read())]
+    save_example_conversation(pairs)
+    logger.info(
+        f"Converted {LEGACY_EXAMPLE_CONVERSATION_FILE} to {EXAMPLE_CONVERSATION_FILE}"
+    )
+
+
+def _read_pairs() -> List[MessagePair]:
+    """Read all message pairs from file, raising on error."""
+    _migrate_legacy_file()
+    with open(EXAMPLE_CONVERSATION_FILE, "rb") as f:
+        return [MessagePair(**orjson.loads(line)) for line in f if line.strip()]
+
+
 def load_example_conversation() -> List[LLMMessage]:
     """Load the example conversation from file and convert to LLM messages."""
     try:
-        with open(EXAMPLE_CONVERSATION_FILE, "r") as f:
-            data = json.load(f)
-            messages: List[LLMMessage] = []
-            for pair in data:
-                messages.append(LLMMessage(role="user", content=pair["user"]))
-                messages.append(LLMMessage(role="assistant", content=pair["assistant"]))
-            logger.debug(f"Loaded {len(messages)} messages from example conversation")
-
-            # Append tool examples from the registry
-            tool_examples = tool_registry.get_examples()
-            for tool_name, examples in tool_examples.items():
-                for example in examples:
-                    # Add user query or bot message if present
-                    user_query = example.get("user_query")
-                    bot_message = example.get("bot_message")
-                    tool_args = example.get("tool_args", {})
-                    response = example.get("response", "")
-
-                    if user_query:
-                        messages.append(LLMMessage(role="user", content=user_query))
-                    if bot_message:
-                        messages.append(
-                            LLMMessage(role="assistant", content=bot_message)
-                        )
-
-                    # Add tool call
-                    messages.append(
-                        LLMMessage(
-                            role="assistant",
-                            tool_calls=[
-                                LLMMessage.ToolCall(
-                                    function=LLMMessage.ToolCall.Function(
-                                        name=tool_name,
-                                        arguments=tool_args,
-                                    )
+        messages: List[LLMMessage] = []
+        for pair in _read_pairs():
+            messages.append(LLMMessage(role="user", content=pair.user))
+            messages.append(LLMMessage(role="assistant", content=pair.assistant))
+        logger.debug(f"Loaded {len(messages)} messages from example conversation")
+
+        # Append tool examples from the registry
+        tool_examples = tool_registry.get_examples()
+        for tool_name, examples in tool_examples.items():
+            for example in examples:
+                # Add user query or bot message if present
+                user_query = example.get("user_query")
+                bot_message = example.get("bot_message")
+                tool_args = example.get("tool_args", {})
+                response = example.get("response", "")
+
+                if user_query:
+                    messages.append(LLMMessage(role="user", content=user_query))
+                if bot_message:
+                    messages.append(LLMMessage(role="assistant", content=bot_message))
+
+                # Add tool call
+                messages.append(
+                    LLMMessage(
+                        role="assistant",
+                        tool_calls=[
+                            LLMMessage.ToolCall(
+                                function=LLMMessage.ToolCall.Function(
+                                    name=tool_name,
+                                    arguments=tool_args,
                                 )
-                            ],
-                        )
+                            )
+                        ],
                     )
-                    messages.append(LLMMessage(role="tool", content=response))
+                )
+                messages.append(LLMMessage(role="tool", content=response))
 
-            logger.debug(
-                f"Added tool examples from {len(tool_examples)} tools to conversation"
-            )
+        logger.debug(
+            f"Added tool examples from {len(tool_examples)} tools to conversation"
+        )
 
-            return messages
+        return messages
     except Exception as e:
         logger.error(f"Error loading example conversation: {e}")
         return []
@@ -84,10 +106,9 @@ def save_example_conversation(pairs: List[MessagePair]) -> None:
         pairs: List of message pairs to save
     """
     try:
-        with open(EXAMPLE_CONVERSATION_FILE, "w") as f:
-            json.dump(
-                [{"user": p.user, "assistant": p.assistant} for p in pairs], f, indent=4
-            )
+        # orjson serializes the MessagePair dataclasses natively
+        with open(EXAMPLE_CONVERSATION_FILE, "wb") as f:
+            f.write(b"".join(orjson.dumps(pair) + b"\n" for pair in pairs))
             logger.debug(
                 f"Saved {len(pairs)} message pairs to example conversation file"
             )
@@ -98,30 +119,44 @@ def save_example_conversation(pairs: List[MessagePair]) -> None:
 def load_pairs() -> List[MessagePair]:
     """Load the raw message pairs from file."""
     try:
-        with open(EXAMPLE_CONVERSATION_FILE, "r") as f:
-            data = json.load(f)
-            return [MessagePair(**pair) for pair in data]
+        return _read_pairs()
     except Exception as e:
         logger.error(f"Error loading example conversation pairs: {e}")
         return []
 
 
-def add_pair(user_msg: str, assistant_msg: str) -> List[MessagePair]:
+def count_pairs() -> int:
+    """Count the message pairs in the file without decoding them."""
+    try:
+        _migrate_legacy_file()
+        with open(EXAMPLE_CONVERSATION_FILE, "rb") as f:
+            return sum(1 for line in f if line.strip())
+    except Exception as e:
+        logger.error(f"Error counting example conversation pairs: {e}")
+        return 0
+
+
+def add_pair(user_msg: str, assistant_msg: str) -> MessagePair:
     """Add a message pair to the example conversation.
 
+    The pair is appended to the end of the file without rewriting it.
+
     Args:
         user_msg: The user's message
         assistant_msg: The assistant's response
 
     Returns:
-        Updated list of message pairs
+        The added message pair
     """
-    pairs = load_pairs()
     new_pair = MessagePair(user=user_msg, assistant=assistant_msg)
-    pairs.append(new_pair)
-    save_example_conversation(pairs)
-    logger.info("Added new message pair to example conversation")
-    return pairs
+    try:
+        _migrate_legacy_file()
+        with open(EXAMPLE_CONVERSATION_FILE, "ab") as f:
+            f.write(orjson.dumps(new_pair) + b"\n")
+        logger.info("Added new message pair to example conversation")
+    except Exception as e:
+        logger.error(f"Error adding example conversation pair: {e}")
+    return new_pair
 
 
 def remove_pair(index: int) -> Tuple[List[MessagePair], Optional[MessagePair]]:
@@ -1,13 +1,17 @@
 """Script to import JSON message files into SQLite database."""
 
-import json
+import hashlib
 import logging
+import os
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-import pendulum
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+import orjson
+from sqlalchemy import Connection, create_engine, event, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql.dml import Insert
 
 from models import (
     Attachment,
@@ -15,6 +19,7 @@ from models import (
     Channel,
     Embed,
     EmbedField,
+    ImportLog,
     InlineEmoji,
     Message,
     MessageMention,
@@ -34,6 +39,72 @@ logging.basicConfig(
 )
 logger = logging.getLogger("deepbot.import_json")
 
+# Number of messages to import per transaction
+BATCH_SIZE = 10000
+
+# Message IDs per existence lookup, below SQLite's bound parameter limit
+ID_LOOKUP_SIZE = 500
+
+# Connection-level tuning for bulk loading. WAL avoids a full fsync per
+# commit and the larger page cache/mmap keep the working set in memory.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-262144",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Shared stand-in for absent nested objects; never mutated
+_EMPTY: Dict[str, Any] = {}
+
+# Fields that must be present in each exported object
+FILE_REQUIRED_FIELDS = ("channel", "messages")
+CHANNEL_REQUIRED_FIELDS = ("id", "type", "name")
+MESSAGE_REQUIRED_FIELDS = ("id", "timestamp")
+
+# Leading bytes of each file hashed to detect edits that keep the mtime
+FINGERPRINT_BYTES = 1024 * 1024
+
+# Link tables whose rows are skipped rather than rejected if already present
+ASSOCIATION_MODELS = (UserRole, ReactionUser)
+
+# Storage format SQLAlchemy uses for DateTime columns on SQLite
+SQLITE_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+# Users and messages are the highest-volume inserts, so they bypass statement
+# compilation and go straight to the driver's executemany. Rows for these
+# tables are built as tuples in the column order below. Messages are not
+# inserted with OR IGNORE: IDs already stored under any channel are skipped
+# beforehand, so a conflict is a real error that sends the batch down the
+# per-message retry.
+USER_INSERT_SQL = (
+    "INSERT OR IGNORE INTO users "
+    "(id, name, discriminator, nickname, color, isBot, avatarUrl) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+MESSAGE_INSERT_SQL = (
+    "INSERT INTO messages "
+    "(id, channel_id, author_id, content, timestamp, timestamp_edited, "
+    "call_ended_timestamp, is_pinned, type) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def configure_sqlite_connection(dbapi_connection: Any, connection_record: Any) -> None:
+    """Apply bulk-import PRAGMAs to a new SQLite connection.
+
+    Args:
+        dbapi_connection: Raw sqlite3 connection
+        connection_record: SQLAlchemy connection pool record (unused)
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 
 def validate_channel_data(channel_data: Dict[str, Any]) -> bool:
     """Validate channel data from JSON file.
@@ -44,9 +115,10 @@ def validate_channel_data(channel_data: Dict[str, Any]) -> bool:
     Returns:
         True if data is valid, False otherwise
     """
-    required_fields = ["id", "type", "name"]
-    if not all(field in channel_data for field in required_fields):
-        logger.error(f"Missing required fields in channel data: {required_fields}")
+    if not all(field in channel_data for field in CHANNEL_REQUIRED_FIELDS):
+        logger.error(
+            f"Missing required fields in channel data: {list(CHANNEL_REQUIRED_FIELDS)}"
+        )
         return False
     return True
 
@@ -60,11 +132,8 @@ def validate_message_data(message_data: Dict[str, Any]) -> bool:
     Returns:
         True if data is valid, False otherwise
     """
-    required_fields = ["id", "timestamp"]
-    if not all(field in message_data for field in required_fields):
-        logger.error(f"Missing required fields in message data: {required_fields}")
-        return False
-    return True
+    # Failures are logged once per file by the caller
+    return all(field in message_data for field in MESSAGE_REQUIRED_FIELDS)
 
 
 def load_json_file(file_path: str) -> Optional[Dict[str, Any]]:
@@ -74,279 +143,504 @@ def load_json_file(file_path: str) -> Optional[Dict[str, Any]]:
         file_path: Path to the JSON file
 
     Returns:
-        Parsed JSON data or None if file doesn't exist or is invalid
+        Parsed JSON data with invalid messages removed, or None if file
+        doesn't exist or is invalid
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data: Dict[str, Any] = json.load(f)
-
-            # Validate required top-level fields
-            if not all(field in data for field in ["channel", "messages"]):
-                logger.error(f"Missing required fields in JSON file: {file_path}")
-                return None
-
-            # Validate channel data
-            if not validate_channel_data(data["channel"]):
-                logger.error(f"Invalid channel data in file: {file_path}")
-                return None
+        # Read raw bytes and let orjson decode them, skipping the text
+        # file layer and a separate UTF-8 decoding pass
+        data: Dict[str, Any] = orjson.loads(Path(file_path).read_bytes())
+
+        # Validate required top-level fields
+        if not all(field in data for field in FILE_REQUIRED_FIELDS):
+            logger.error(f"Missing required fields in JSON file: {file_path}")
+            return None
+
+        # Validate channel data
+        if not validate_channel_data(data["channel"]):
+            logger.error(f"Invalid channel data in file: {file_path}")
+            return None
+
+        # Drop invalid messages up front so the import loop only sees
+        # records it can insert
+        messages = data["messages"]
+        valid_messages = [m for m in messages if validate_message_data(m)]
+        skipped = len(messages) - len(valid_messages)
+        if skipped:
+            logger.error(
+                f"Skipping {skipped} messages missing required fields "
+                f"{list(MESSAGE_REQUIRED_FIELDS)} in file: {file_path}"
+            )
+            data["messages"] = valid_messages
 
-            return data
+        return data
     except FileNotFoundError:
         logger.warning(f"File not found: {file_path}")
         return None
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Invalid JSON in {file_path}: {e}")
         return None
 
 
-def convert_timestamp(timestamp_str: str) -> pendulum.DateTime:
-    """Convert ISO format timestamp string to pendulum DateTime.
+def convert_timestamp(timestamp_str: str) -> datetime:
+    """Convert ISO format timestamp string to datetime.
+
+    Discord exports use plain ISO 8601, which the stdlib parser handles far
+    faster than pendulum's multi-format parser.
 
     Args:
         timestamp_str: ISO format timestamp string
 
     Returns:
-        pendulum DateTime object
+        datetime object
+
+    Raises:
+        ValueError: If the timestamp is not valid ISO 8601
     """
-    dt = pendulum.parse(timestamp_str)
-    if not isinstance(dt, pendulum.DateTime):
-        raise ValueError(f"Invalid timestamp format: {timestamp_str}")
-    return dt
+    return datetime.fromisoformat(timestamp_str)
 
 
-def process_roles(
-    session: Session, user_id: str, roles_data: List[Dict[str, Any]]
-) -> None:
-    """Process and create roles for a user.
+def format_timestamp(timestamp_str: str) -> str:
+    """Convert ISO format timestamp string to SQLite's stored form.
+
+    Used for rows inserted through the raw driver, which does not apply
+    SQLAlchemy's DateTime conversion.
 
     Args:
-        session: SQLAlchemy session
-        user_id: ID of the user
-        roles_data: List of role data dictionaries
-    """
-    for role_data in roles_data:
-        # Create or update role
-        role = session.query(Role).filter(Role.id == role_data["id"]).first()
-        if not role:
-            role = Role(
-                id=role_data["id"],
-                name=role_data["name"],
-                color=role_data.get("color"),
-                position=role_data["position"],
-            )
-            session.add(role)
+        timestamp_str: ISO format timestamp string
 
-        # Create user-role association
-        user_role = UserRole(user_id=user_id, role_id=role.id)
-        session.add(user_role)
+    Returns:
+        Timestamp formatted as SQLAlchemy stores it in SQLite
 
+    Raises:
+        ValueError: If the timestamp is not valid ISO 8601
+    """
+    return datetime.fromisoformat(timestamp_str).strftime(SQLITE_DATETIME_FORMAT)
 
-def process_attachments(
-    session: Session, message_id: str, attachments_data: List[Dict[str, Any]]
-) -> None:
-    """Process and create attachments for a message.
 
-    Args:
-        session: SQLAlchemy session
-        message_id: ID of the message
-        attachments_data: List of attachment data dictionaries
+@dataclass
+class ImportBuffers:
+    """Rows pending insertion for the current batch, one list per table.
+
+    Parent rows (embeds, reactions) get their primary keys assigned here so
+    their children can reference them without a flush per parent; IDs
+    handed out to a batch that is rolled back are assigned again. Users
+    and roles are deduplicated against the database and the pending batch
+    so each is inserted exactly once.
     """
-    for attachment_data in attachments_data:
-        attachment = Attachment(
-            id=attachment_data["id"],
-            message_id=message_id,
-            url=attachment_data["url"],
-            fileName=attachment_data["fileName"],
-            fileSizeBytes=attachment_data["fileSizeBytes"],
-            proxyUrl=attachment_data.get("proxyUrl"),
-            width=attachment_data.get("width"),
-            height=attachment_data.get("height"),
-            contentType=attachment_data.get("contentType"),
+
+    next_embed_id: int = 1
+    next_reaction_id: int = 1
+    committed_embed_id: int = 1
+    committed_reaction_id: int = 1
+    known_user_ids: Set[str] = field(default_factory=set)
+    known_role_ids: Set[str] = field(default_factory=set)
+    users: Dict[str, Tuple[Any, ...]] = field(default_factory=dict)
+    roles: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    user_roles: List[Dict[str, Any]] = field(default_factory=list)
+    messages: List[Tuple[Any, ...]] = field(default_factory=list)
+    attachments: List[Dict[str, Any]] = field(default_factory=list)
+    embeds: List[Dict[str, Any]] = field(default_factory=list)
+    embed_fields: List[Dict[str, Any]] = field(default_factory=list)
+    reactions: List[Dict[str, Any]] = field(default_factory=list)
+    reaction_users: List[Dict[str, Any]] = field(default_factory=list)
+    stickers: List[Dict[str, Any]] = field(default_factory=list)
+    inline_emojis: List[Dict[str, Any]] = field(default_factory=list)
+    references: List[Dict[str, Any]] = field(default_factory=list)
+    mentions: List[Dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def for_connection(cls, conn: Connection) -> "ImportBuffers":
+        """Create buffers seeded with the IDs already in the database.
+
+        Args:
+            conn: SQLAlchemy connection
+
+        Returns:
+            Empty ImportBuffers
+        """
+        max_embed_id = conn.scalar(select(func.max(Embed.id))) or 0
+        max_reaction_id = conn.scalar(select(func.max(Reaction.id))) or 0
+        return cls(
+            next_embed_id=max_embed_id + 1,
+            next_reaction_id=max_reaction_id + 1,
+            committed_embed_id=max_embed_id + 1,
+            committed_reaction_id=max_reaction_id + 1,
+            known_user_ids=set(conn.scalars(select(User.id))),
+            known_role_ids=set(conn.scalars(select(Role.id))),
         )
-        session.add(attachment)
 
+    def add_user(self, user_data: Dict[str, Any]) -> bool:
+        """Buffer a user and their roles unless the user is already known.
+
+        Args:
+            user_data: Author data dictionary
+
+        Returns:
+            True if the user is new, False otherwise
+        """
+        user_id = user_data["id"]
+        if user_id in self.known_user_ids or user_id in self.users:
+            return False
+
+        self.users[user_id] = (
+            user_id,
+            user_data.get("name", ""),
+            user_data.get("discriminator", "0"),
+            user_data.get("nickname"),
+            user_data.get("color"),
+            user_data.get("isBot", False),
+            user_data.get("avatarUrl", ""),
+        )
 
-def process_embeds(
-    session: Session, message_id: str, embeds_data: List[Dict[str, Any]]
+        # Only new users get role links, so duplicates can only come from
+        # a role listed twice for the same user
+        user_role_ids: Set[str] = set()
+        for role_data in user_data.get("roles", ()):
+            role_id = role_data["id"]
+            if role_id not in self.known_role_ids and role_id not in self.roles:
+                self.roles[role_id] = {
+                    "id": role_id,
+                    "name": role_data["name"],
+                    "color": role_data.get("color"),
+                    "position": role_data["position"],
+                }
+            if role_id not in user_role_ids:
+                user_role_ids.add(role_id)
+                self.user_roles.append({"user_id": user_id, "role_id": role_id})
+
+        return True
+
+    def _tables(self) -> List[Tuple[type[Base], List[Dict[str, Any]]]]:
+        """Return (model, rows) pairs inserted after messages, in order."""
+        return [
+            (UserRole, self.user_roles),
+            (Attachment, self.attachments),
+            (Embed, self.embeds),
+            (EmbedField, self.embed_fields),
+            (Reaction, self.reactions),
+            (ReactionUser, self.reaction_users),
+            (Sticker, self.stickers),
+            (InlineEmoji, self.inline_emojis),
+            (MessageReference, self.references),
+            (MessageMention, self.mentions),
+        ]
+
+    def flush(self, conn: Connection) -> None:
+        """Insert all pending rows with one executemany per table.
+
+        Inserted users and roles stay pending until mark_committed is called,
+        so a rolled-back batch does not leave them marked as present.
+
+        Args:
+            conn: SQLAlchemy connection
+        """
+        if self.users:
+            conn.exec_driver_sql(USER_INSERT_SQL, list(self.users.values()))
+        if self.roles:
+            conn.execute(insert(Role), list(self.roles.values()))
+        if self.messages:
+            conn.exec_driver_sql(MESSAGE_INSERT_SQL, self.messages)
+            self.messages.clear()
+        for model, rows in self._tables():
+            if rows:
+                statement: Insert
+                if model in ASSOCIATION_MODELS:
+                    statement = sqlite_insert(model).on_conflict_do_nothing()
+                else:
+                    statement = insert(model)
+                conn.execute(statement, rows)
+                rows.clear()
+
+    def mark_committed(self) -> None:
+        """Record the flushed users, roles and parent IDs as committed.
+
+        Call only once the transaction containing the flush has committed.
+        """
+        self.committed_embed_id = self.next_embed_id
+        self.committed_reaction_id = self.next_reaction_id
+        self.known_user_ids.update(self.users)
+        self.known_role_ids.update(self.roles)
+        self.users.clear()
+        self.roles.clear()
+
+    def clear(self) -> None:
+        """Discard all pending rows and reuse their embed and reaction IDs."""
+        self.next_embed_id = self.committed_embed_id
+        self.next_reaction_id = self.committed_reaction_id
+        self.users.clear()
+        self.roles.clear()
+        self.messages.clear()
+        for _, rows in self._tables():
+            rows.clear()
+
+
+def buffer_message_rows(
+    buffers: ImportBuffers,
+    channel_id: str,
+    author_id: Optional[str],
+    msg_data: Dict[str, Any],
 ) -> None:
-    """Process and create embeds for a message.
+    """Build the rows for a message and all of its components.
+
+    Every component table is filled in a single pass over the message so
+    the per-message cost is one call rather than one per table.
 
     Args:
-        session: SQLAlchemy session
-        message_id: ID of the message
-        embeds_data: List of embed data dictionaries
+        buffers: Pending row buffers
+        channel_id: ID of the channel the message belongs to
+        author_id: ID of the message author, if any
+        msg_data: Message data dictionary
     """
-    for embed_data in embeds_data:
-        embed = Embed(
-            message_id=message_id,
-            title=embed_data.get("title"),
-            type=embed_data.get("type", "rich"),
-            description=embed_data.get("description"),
-            url=embed_data.get("url"),
-            timestamp=(
-                convert_timestamp(embed_data["timestamp"])
-                if embed_data.get("timestamp")
-                else None
-            ),
-            color=embed_data.get("color"),
-            footer_text=embed_data.get("footer", {}).get("text"),
-            footer_iconUrl=embed_data.get("footer", {}).get("iconUrl"),
-            image_url=embed_data.get("image", {}).get("url"),
-            image_proxyUrl=embed_data.get("image", {}).get("proxyUrl"),
-            image_width=embed_data.get("image", {}).get("width"),
-            image_height=embed_data.get("image", {}).get("height"),
-            thumbnail_url=embed_data.get("thumbnail", {}).get("url"),
-            thumbnail_proxyUrl=embed_data.get("thumbnail", {}).get("proxyUrl"),
-            thumbnail_width=embed_data.get("thumbnail", {}).get("width"),
-            thumbnail_height=embed_data.get("thumbnail", {}).get("height"),
-            video_url=embed_data.get("video", {}).get("url"),
-            video_width=embed_data.get("video", {}).get("width"),
-            video_height=embed_data.get("video", {}).get("height"),
-            provider_name=embed_data.get("provider", {}).get("name"),
-            provider_url=embed_data.get("provider", {}).get("url"),
-            author_name=embed_data.get("author", {}).get("name"),
-            author_url=embed_data.get("author", {}).get("url"),
-            author_iconUrl=embed_data.get("author", {}).get("iconUrl"),
+    message_id = msg_data["id"]
+
+    # Create message
+    timestamp_edited = msg_data.get("timestampEdited")
+    call_ended_timestamp = msg_data.get("callEndedTimestamp")
+    buffers.messages.append(
+        (
+            message_id,
+            channel_id,
+            author_id,
+            msg_data.get("content", ""),
+            format_timestamp(msg_data["timestamp"]),
+            format_timestamp(timestamp_edited) if timestamp_edited else None,
+            (format_timestamp(call_ended_timestamp) if call_ended_timestamp else None),
+            msg_data.get("isPinned", False),
+            msg_data.get("type", "Default"),
         )
-        session.add(embed)
-        session.flush()  # Get embed ID
-
-        # Process embed fields
-        for field_data in embed_data.get("fields", []):
-            field = EmbedField(
-                embed_id=embed.id,
-                name=field_data["name"],
-                value=field_data["value"],
-                inline=field_data.get("inline", False),
-            )
-            session.add(field)
+    )
 
+    # Attachments
+    for attachment_data in msg_data.get("attachments", ()):
+        buffers.attachments.append(
+            {
+                "id": attachment_data["id"],
+                "message_id": message_id,
+                "url": attachment_data["url"],
+                "fileName": attachment_data["fileName"],
+                "fileSizeBytes": attachment_data["fileSizeBytes"],
+                "proxyUrl": attachment_data.get("proxyUrl"),
+                "width": attachment_data.get("width"),
+                "height": attachment_data.get("height"),
+                "contentType": attachment_data.get("contentType"),
+            }
+        )
 
-def process_reactions(
-    session: Session, message_id: str, reactions_data: List[Dict[str, Any]]
-) -> None:
-    """Process and create reactions for a message.
+    # Embeds and their fields
+    for embed_data in msg_data.get("embeds", ()):
+        footer = embed_data.get("footer") or _EMPTY
+        image = embed_data.get("image") or _EMPTY
+        thumbnail = embed_data.get("thumbnail") or _EMPTY
+        video = embed_data.get("video") or _EMPTY
+        provider = embed_data.get("provider") or _EMPTY
+        author = embed_data.get("author") or _EMPTY
+        timestamp = embed_data.get("timestamp")
+
+        embed_id = buffers.next_embed_id
+        buffers.next_embed_id += 1
+        buffers.embeds.append(
+            {
+                "id": embed_id,
+                "message_id": message_id,
+                "title": embed_data.get("title"),
+                "type": embed_data.get("type", "rich"),
+                "description": embed_data.get("description"),
+                "url": embed_data.get("url"),
+                "timestamp": convert_timestamp(timestamp) if timestamp else None,
+                "color": embed_data.get("color"),
+                "footer_text": footer.get("text"),
+                "footer_iconUrl": footer.get("iconUrl"),
+                "image_url": image.get("url"),
+                "image_proxyUrl": image.get("proxyUrl"),
+                "image_width": image.get("width"),
+                "image_height": image.get("height"),
+                "thumbnail_url": thumbnail.get("url"),
+                "thumbnail_proxyUrl": thumbnail.get("proxyUrl"),
+                "thumbnail_width": thumbnail.get("width"),
+                "thumbnail_height": thumbnail.get("height"),
+                "video_url": video.get("url"),
+                "video_width": video.get("width"),
+                "video_height": video.get("height"),
+                "provider_name": provider.get("name"),
+                "provider_url": provider.get("url"),
+                "author_name": author.get("name"),
+                "author_url": author.get("url"),
+                "author_iconUrl": author.get("iconUrl"),
+            }
+        )
 
-    Args:
-        session: SQLAlchemy session
-        message_id: ID of the message
-        reactions_data: List of reaction data dictionaries
-    """
-    for reaction_data in reactions_data:
+        for field_data in embed_data.get("fields", ()):
+            buffers.embed_fields.append(
+                {
+                    "embed_id": embed_id,
+                    "name": field_data["name"],
+                    "value": field_data["value"],
+                    "inline": field_data.get("inline", False),
+                }
+            )
+
+    # Reactions and the users who reacted
+    for reaction_data in msg_data.get("reactions", ()):
         emoji_data = reaction_data["emoji"]
-        reaction = Reaction(
-            message_id=message_id,
-            emoji_id=emoji_data.get("id"),
-            emoji_name=emoji_data["name"],
-            emoji_code=emoji_data["code"],
-            isAnimated=emoji_data.get("isAnimated", False),
-            emoji_imageUrl=emoji_data.get("imageUrl"),
-            count=reaction_data["count"],
+        reaction_id = buffers.next_reaction_id
+        buffers.next_reaction_id += 1
+        buffers.reactions.append(
+            {
+                "id": reaction_id,
+                "message_id": message_id,
+                "emoji_id": emoji_data.get("id"),
+                "emoji_name": emoji_data["name"],
+                "emoji_code": emoji_data["code"],
+                "isAnimated": emoji_data.get("isAnimated", False),
+                "emoji_imageUrl": emoji_data.get("imageUrl"),
+                "count": reaction_data["count"],
+            }
         )
-        session.add(reaction)
-        session.flush()  # Get reaction ID
-
-        # Process reaction users
-        for user_data in reaction_data.get("users", []):
-            reaction_user = ReactionUser(
-                reaction_id=reaction.id,
-                user_id=user_data["id"],
-            )
-            session.add(reaction_user)
 
+        # Reaction IDs are fresh, so only users repeated within this
+        # reaction can collide
+        reaction_user_ids: Set[str] = set()
+        for user_data in reaction_data.get("users", ()):
+            user_id = user_data["id"]
+            if user_id not in reaction_user_ids:
+                reaction_user_ids.add(user_id)
+                buffers.reaction_users.append(
+                    {"reaction_id": reaction_id, "user_id": user_id}
+                )
+
+    # Stickers
+    for sticker_data in msg_data.get("stickers", ()):
+        buffers.stickers.append(
+            {
+                "id": sticker_data["id"],
+                "message_id": message_id,
+                "name": sticker_data["name"],
+                "formatType": sticker_data["formatType"],
+                "description": sticker_data.get("description"),
+                "url": sticker_data.get("url"),
+            }
+        )
 
-def process_stickers(
-    session: Session, message_id: str, stickers_data: List[Dict[str, Any]]
-) -> None:
-    """Process and create stickers for a message.
+    # Inline emojis
+    for emoji_data in msg_data.get("inlineEmojis", ()):
+        buffers.inline_emojis.append(
+            {
+                "message_id": message_id,
+                "emoji_id": emoji_data.get("id"),
+                "name": emoji_data["name"],
+                "code": emoji_data["code"],
+                "isAnimated": emoji_data.get("isAnimated", False),
+                "imageUrl": emoji_data["imageUrl"],
+            }
+        )
 
-    Args:
-        session: SQLAlchemy session
-        message_id: ID of the message
-        stickers_data: List of sticker data dictionaries
-    """
-    for sticker_data in stickers_data:
-        sticker = Sticker(
-            id=sticker_data["id"],
-            message_id=message_id,
-            name=sticker_data["name"],
-            formatType=sticker_data["formatType"],
-            description=sticker_data.get("description"),
-            url=sticker_data.get("url"),
+    # Reply reference
+    reference_data = msg_data.get("reference")
+    if reference_data:
+        buffers.references.append(
+            {
+                "message_id": message_id,
+                "referenced_message_id": reference_data["messageId"],
+                "referenced_channel_id": reference_data["channelId"],
+                "referenced_guild_id": reference_data["guildId"],
+            }
         )
-        session.add(sticker)
 
+    # Mentions
+    for mention_data in msg_data.get("mentions", ()):
+        buffers.mentions.append(
+            {"message_id": message_id, "user_id": mention_data["id"]}
+        )
 
-def process_inline_emojis(
-    session: Session, message_id: str, emojis_data: List[Dict[str, Any]]
-) -> None:
-    """Process and create inline emojis for a message.
+
+def import_message_batch(
+    conn: Connection,
+    buffers: ImportBuffers,
+    channel_id: str,
+    batch: List[Dict[str, Any]],
+) -> Tuple[int, int]:
+    """Insert and commit a batch of messages in a single transaction.
 
     Args:
-        session: SQLAlchemy session
-        message_id: ID of the message
-        emojis_data: List of inline emoji data dictionaries
+        conn: SQLAlchemy connection
+        buffers: Pending row buffers, empty on entry
+        channel_id: ID of the channel the messages belong to
+        batch: Validated message data dictionaries
+
+    Returns:
+        Tuple of (messages_imported, users_imported)
+
+    Raises:
+        Exception: Any error building or inserting the rows; the caller is
+            responsible for rolling back and clearing the buffers
     """
-    for emoji_data in emojis_data:
-        emoji = InlineEmoji(
-            message_id=message_id,
-            emoji_id=emoji_data.get("id"),
-            name=emoji_data["name"],
-            code=emoji_data["code"],
-            isAnimated=emoji_data.get("isAnimated", False),
-            imageUrl=emoji_data["imageUrl"],
-        )
-        session.add(emoji)
+    # Bind names used on every iteration to locals so the loop does fast
+    # local lookups instead of global and attribute lookups
+    add_user = buffers.add_user
+    buffer_rows = buffer_message_rows
+    empty = _EMPTY
 
+    users_imported = 0
+    for msg_data in batch:
+        # Buffer the author the first time they are seen
+        author_data = msg_data.get("author") or empty
+        author_id = author_data.get("id")
+        if author_id and add_user(author_data):
+            users_imported += 1
 
-def process_message_reference(
-    session: Session, message_id: str, reference_data: Optional[Dict[str, Any]]
-) -> None:
-    """Process and create message reference.
+        buffer_rows(buffers, channel_id, author_id, msg_data)
 
-    Args:
-        session: SQLAlchemy session
-        message_id: ID of the message
-        reference_data: Message reference data dictionary
-    """
-    if reference_data:
-        reference = MessageReference(
-            message_id=message_id,
-            referenced_message_id=reference_data["messageId"],
-            referenced_channel_id=reference_data["channelId"],
-            referenced_guild_id=reference_data["guildId"],
-        )
-        session.add(reference)
+    buffers.flush(conn)
+    conn.commit()
+    buffers.mark_committed()
+    return len(batch), users_imported
 
 
-def process_mentions(
-    session: Session, message_id: str, mentions_data: List[Dict[str, Any]]
-) -> None:
-    """Process and create message mentions.
+def retry_message_batch(
+    conn: Connection,
+    buffers: ImportBuffers,
+    channel_id: str,
+    batch: List[Dict[str, Any]],
+) -> Tuple[int, int]:
+    """Import a failed batch one message at a time, skipping bad messages.
 
     Args:
-        session: SQLAlchemy session
-        message_id: ID of the message
-        mentions_data: List of mention data dictionaries
+        conn: SQLAlchemy connection
+        buffers: Pending row buffers, empty on entry
+        channel_id: ID of the channel the messages belong to
+        batch: Validated message data dictionaries
+
+    Returns:
+        Tuple of (messages_imported, users_imported)
     """
-    for mention_data in mentions_data:
-        mention = MessageMention(
-            message_id=message_id,
-            user_id=mention_data["id"],
-        )
-        session.add(mention)
+    messages_imported = 0
+    users_imported = 0
+    for msg_data in batch:
+        try:
+            messages_count, users_count = import_message_batch(
+                conn, buffers, channel_id, [msg_data]
+            )
+            messages_imported += messages_count
+            users_imported += users_count
+        except Exception as e:
+            logger.error(f"Error processing message {msg_data.get('id')}: {e}")
+            # Pending rows belong to the transaction being rolled back
+            conn.rollback()
+            buffers.clear()
+    return messages_imported, users_imported
 
 
 def import_channel_data(
-    session: Session,
+    conn: Connection,
     file_data: Dict[str, Any],
     progress_callback: Optional[Callable[[int, int], None]] = None,
 ) -> tuple[int, int]:
     """Import data for a single channel.
 
     Args:
-        session: SQLAlchemy session
-        file_data: Complete JSON data from file
+        conn: SQLAlchemy connection
+        file_data: Complete JSON data from file, as returned by load_json_file
         progress_callback: Optional callback for progress updates
 
     Returns:
@@ -359,112 +653,133 @@ def import_channel_data(
     channel_data = file_data["channel"]
     channel_id = channel_data["id"]
 
-    # Create or update channel
-    channel = session.query(Channel).filter(Channel.id == channel_id).first()
-    if not channel:
-        channel = Channel(
-            id=channel_id,
-            name=channel_data["name"],
-            type=channel_data["type"],
-            guild_id=file_data.get("guild", {}).get("id"),
-            position=channel_data.get("position"),
-            permissions_overwrites=channel_data.get("permissionsOverwrites", []),
-            parent_id=channel_data.get("categoryId"),
-            nsfw=channel_data.get("nsfw", False),
-            rate_limit_per_user=channel_data.get("rateLimitPerUser"),
-            topic=channel_data.get("topic"),
-            bitrate=channel_data.get("bitrate"),
-            user_limit=channel_data.get("userLimit"),
-            last_sync=convert_timestamp(
-                file_data.get("exportedAt", pendulum.now("UTC").isoformat())
-            ),
+    # Create channel if it doesn't exist yet
+    channel_exists = conn.execute(
+        select(Channel.id).where(Channel.id == channel_id)
+    ).first()
+    if not channel_exists:
+        conn.execute(
+            insert(Channel),
+            {
+                "id": channel_id,
+                "name": channel_data["name"],
+                "type": channel_data["type"],
+                "guild_id": file_data.get("guild", {}).get("id"),
+                "position": channel_data.get("position"),
+                "permissions_overwrites": channel_data.get("permissionsOverwrites", []),
+                "parent_id": channel_data.get("categoryId"),
+                "nsfw": channel_data.get("nsfw", False),
+                "rate_limit_per_user": channel_data.get("rateLimitPerUser"),
+                "topic": channel_data.get("topic"),
+                "bitrate": channel_data.get("bitrate"),
+                "user_limit": channel_data.get("userLimit"),
+                "last_sync": convert_timestamp(
+                    file_data.get("exportedAt", datetime.now(UTC).isoformat())
+                ),
+            },
         )
-        session.add(channel)
-        session.commit()
+        conn.commit()
 
     # Process messages
     messages = file_data.get("messages", [])
     total_messages = len(messages)
     logger.info(f"Processing {total_messages} messages for channel {channel_id}")
 
-    for i, msg_data in enumerate(messages, 1):
+    buffers = ImportBuffers.for_connection(conn)
+
+    # Messages already in the database are skipped, whichever channel they
+    # were stored under, so the inserts below only conflict on real errors
+    file_message_ids = list({msg_data["id"] for msg_data in messages})
+    existing_message_ids: Set[str] = set()
+    elsewhere = 0
+    for start in range(0, len(file_message_ids), ID_LOOKUP_SIZE):
+        for message_id, stored_channel_id in conn.execute(
+            select(Message.id, Message.channel_id).where(
+                Message.id.in_(file_message_ids[start : start + ID_LOOKUP_SIZE])
+            )
+        ):
+            existing_message_ids.add(message_id)
+            if stored_channel_id != channel_id:
+                elsewhere += 1
+    if elsewhere:
+        logger.warning(
+            f"Skipping {elsewhere} messages already stored under another channel"
+        )
+    new_messages = []
+    for msg_data in messages:
+        message_id = msg_data["id"]
+        if message_id not in existing_message_ids:
+            existing_message_ids.add(message_id)
+            new_messages.append(msg_data)
+    skipped_existing = total_messages - len(new_messages)
+
+    # Commit in large batches so each transaction covers many rows
+    for start in range(0, len(new_messages), BATCH_SIZE):
+        batch = new_messages[start : start + BATCH_SIZE]
         try:
-            # Validate message data
-            if not validate_message_data(msg_data):
-                logger.error(f"Skipping invalid message data at index {i}")
-                continue
-
-            # Create or update author
-            author_data = msg_data.get("author", {})
-            author_id = author_data.get("id")
-            if author_id:
-                author = session.query(User).filter(User.id == author_id).first()
-                if not author:
-                    author = User(
-                        id=author_id,
-                        name=author_data.get("name", ""),
-                        discriminator=author_data.get("discriminator", "0"),
-                        nickname=author_data.get("nickname"),
-                        color=author_data.get("color"),
-                        isBot=author_data.get("isBot", False),
-                        avatarUrl=author_data.get("avatarUrl", ""),
-                    )
-                    session.add(author)
-                    users_imported += 1
-
-                    # Process author roles
-                    process_roles(session, author_id, author_data.get("roles", []))
-
-            # Create message
-            message = Message(
-                id=msg_data["id"],
-                channel_id=channel_id,
-                author_id=author_id,
-                content=msg_data.get("content", ""),
-                timestamp=convert_timestamp(msg_data["timestamp"]),
-                timestamp_edited=(
-                    convert_timestamp(msg_data.get("timestampEdited"))
-                    if msg_data.get("timestampEdited")
-                    else None
-                ),
-                call_ended_timestamp=(
-                    convert_timestamp(msg_data.get("callEndedTimestamp"))
-                    if msg_data.get("callEndedTimestamp")
-                    else None
-                ),
-                is_pinned=msg_data.get("isPinned", False),
-                type=msg_data.get("type", "Default"),
+            messages_count, users_count = import_message_batch(
+                conn, buffers, channel_id, batch
             )
-            session.add(message)
-            session.flush()  # Get message ID
-
-            # Process message components
-            process_attachments(session, message.id, msg_data.get("attachments", []))
-            process_embeds(session, message.id, msg_data.get("embeds", []))
-            process_reactions(session, message.id, msg_data.get("reactions", []))
-            process_stickers(session, message.id, msg_data.get("stickers", []))
-            process_inline_emojis(session, message.id, msg_data.get("inlineEmojis", []))
-            process_message_reference(session, message.id, msg_data.get("reference"))
-            process_mentions(session, message.id, msg_data.get("mentions", []))
-
-            messages_imported += 1
-
-            # Commit every 100 messages to avoid memory issues
-            if i % 100 == 0:
-                session.commit()
-                if progress_callback:
-                    progress_callback(i, total_messages)
-
         except Exception as e:
-            logger.error(f"Error processing message {msg_data.get('id')}: {e}")
-            session.rollback()
-            continue
+            logger.warning(f"Batch failed ({e}), retrying messages one at a time")
+            conn.rollback()
+            buffers.clear()
+            messages_count, users_count = retry_message_batch(
+                conn, buffers, channel_id, batch
+            )
 
-    # Final commit for this channel
-    session.commit()
+        messages_imported += messages_count
+        users_imported += users_count
+        if progress_callback:
+            progress_callback(start + len(batch), len(new_messages))
+
+    if skipped_existing:
+        logger.info(f"Skipped {skipped_existing} messages already in the database")
     return messages_imported, users_imported
 
 
+def file_fingerprint(file_path: str) -> Tuple[float, str]:
+    """Identify the current contents of a file cheaply.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Tuple of (modification time, SHA-256 of the first FINGERPRINT_BYTES)
+    """
+    with open(file_path, "rb") as f:
+        digest = hashlib.sha256(f.read(FINGERPRINT_BYTES)).hexdigest()
+    return os.stat(file_path).st_mtime, digest
+
+
+def record_import(
+    conn: Connection, file_path: str, fingerprint: Tuple[float, str], rows: int
+) -> None:
+    """Record a successfully imported file in the import log.
+
+    Args:
+        conn: SQLAlchemy connection
+        file_path: Absolute path of the imported file
+        fingerprint: File fingerprint from file_fingerprint
+        rows: Number of messages imported from the file
+    """
+    mtime, sha256 = fingerprint
+    statement = sqlite_insert(ImportLog).values(
+        path=file_path, mtime=mtime, sha256=sha256, rows_imported=rows
+    )
+    conn.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ImportLog.path],
+            set_={
+                "mtime": statement.excluded.mtime,
+                "sha256": statement.excluded.sha256,
+                "rows_imported": statement.excluded.rows_imported,
+            },
+        )
+    )
+    conn.commit()
+
+
 def import_data(
     data_dir: str,
     db_path: str,
@@ -479,14 +794,34 @@ def import_data(
     """
     # Create database and tables
     engine = create_engine(f"sqlite:///{db_path}")
+    event.listen(engine, "connect", configure_sqlite_connection)
     Base.metadata.create_all(engine)
 
     # Get list of JSON files
-    data_path = Path(data_dir)
-    json_files = list(data_path.glob("*.json"))
+    all_files = [
+        os.path.abspath(entry.path)
+        for entry in os.scandir(data_dir)
+        if entry.name.endswith(".json") and entry.is_file()
+    ]
+
+    # Skip files that are unchanged since they were last imported
+    with engine.connect() as conn:
+        import_log = {
+            path: (mtime, sha256)
+            for path, mtime, sha256 in conn.execute(
+                select(ImportLog.path, ImportLog.mtime, ImportLog.sha256)
+            )
+        }
+    fingerprints = {path: file_fingerprint(path) for path in all_files}
+    json_files = [
+        path for path in all_files if import_log.get(path) != fingerprints[path]
+    ]
     total_files = len(json_files)
 
-    logger.info(f"Found {total_files} JSON files to process")
+    logger.info(
+        f"Found {total_files} JSON files to process "
+        f"({len(all_files) - total_files} unchanged since last import)"
+    )
 
     total_messages = 0
     total_users = 0
@@ -495,13 +830,14 @@ def import_data(
         logger.info(f"Processing file {i}/{total_files}: {file_path}")
 
         # Load and validate file data
-        file_data = load_json_file(str(file_path))
+        file_data = load_json_file(file_path)
         if not file_data:
             continue
 
         # Import channel data
-        with Session(engine) as session:
-            messages, users = import_channel_data(session, file_data, progress_callback)
+        with engine.connect() as conn:
+            messages, users = import_channel_data(conn, file_data, progress_callback)
+            record_import(conn, file_path, fingerprints[file_path], messages)
             total_messages += messages
             total_users += users
 
@@ -2,8 +2,10 @@ import asyncio
 import logging
 import os
 import re
+import time
+from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Set, Tuple
 
 import discord
 import ollama
@@ -30,6 +32,36 @@ MESSAGE_HISTORY_LIMIT = 1
 # Max messages bot sends before needing new user input
 MAX_MESSAGES_PER_INTERACTION = 30
 
+# Formatted messages cached per channel. Extra room beyond the history limit
+# keeps older messages around when a completion's output lands after the
+# message being answered.
+HISTORY_CACHE_SIZE = MESSAGE_HISTORY_LIMIT + MAX_MESSAGES_PER_INTERACTION + 1
+
+# Runs of blank or whitespace-only lines inside a message
+BLANK_LINES_PATTERN = re.compile(r"\n\s*\n")
+
+# Start of every line in a message
+LINE_START_PATTERN = re.compile(r"^", re.MULTILINE)
+
+# Name of the webhook the bot creates and reuses in each channel
+WEBHOOK_NAME = "IRC Completion Bot"
+
+# Discord allows 5 requests per 2 seconds per webhook
+WEBHOOK_RATE_LIMIT = 5
+WEBHOOK_RATE_PERIOD = 2.0
+
+# Channels whose webhooks are kept in memory
+WEBHOOK_CACHE_SIZE = 64
+
+# Discord's maximum message length, used when joining lines from one user
+WEBHOOK_MESSAGE_LENGTH_LIMIT = 2000
+
+# Seconds before retrying a channel where the bot may not manage webhooks
+WEBHOOK_RETRY_DELAY = 600.0
+
+# Parsed lines that may wait for the webhook sender before generation pauses
+WEBHOOK_SEND_QUEUE_SIZE = 10
+
 
 @dataclass
 class ActiveCompletion:
@@ -38,12 +70,47 @@ class ActiveCompletion:
     task: Optional[asyncio.Task[None]] = None
 
 
+class WebhookRateLimiter:
+    """Token bucket allowing `rate` sends per `period` seconds."""
+
+    def __init__(self, rate: int, period: float):
+        self.rate = rate
+        self.period = period
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a send is allowed, then consume a token."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.rate,
+                    self.tokens + (now - self.updated) * self.rate / self.period,
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) * self.period / self.rate)
+
+
 class IRCCompletionBot:
     def __init__(self, bot: commands.Bot, api_client: ollama.AsyncClient):
         self.bot = bot
         self.channel_histories: Dict[int, str] = {}
+        self.history_cache: Dict[int, Deque[Tuple[int, str]]] = defaultdict(
+            lambda: deque(maxlen=HISTORY_CACHE_SIZE)
+        )
         self.webhook_url: Optional[str] = WEBHOOK_URL
-        self.webhook_cache: Dict[int, discord.Webhook] = {}
+        self.webhook_cache: OrderedDict[int, discord.Webhook] = OrderedDict()
+        self.webhook_limiters: Dict[int, WebhookRateLimiter] = {}
+        self.webhook_locks: Dict[int, asyncio.Lock] = {}
+        self.webhook_failures: Dict[int, float] = {}
+        self.bot_status: Optional[str] = None
+        self.shown_bot_status: Optional[str] = None
+        self.bot_status_task: Optional[asyncio.Task[None]] = None
         self.active_completion_state: Optional[ActiveCompletion] = None
         self.monitored_channel_name: str = MONITORED_CHANNEL_NAME
         self.monitored_channel_instance: Optional[discord.TextChannel] = None
@@ -52,43 +119,41 @@ class IRCCompletionBot:
         self.api_client = api_client
         self.blacklisted_users = self._load_blacklist()
 
-        # Add regex patterns for mentions and emojis
-        self.mention_pattern = re.compile(r"<@!?(\d+)>")
-        self.emoji_pattern = re.compile(r"<:([^:]+):(\d+)>")
+        # Add regex pattern for mentions (group 1) and emojis (group 2)
+        self.markup_pattern = re.compile(r"<(?:@!?(\d+)|:([^:]+):\d+)>")
 
-    def _load_blacklist(self) -> set[str]:
+    def _load_blacklist(self) -> frozenset[str]:
         """Load blacklisted usernames from file"""
         try:
             if os.path.exists(BLACKLIST_FILE):
                 with open(BLACKLIST_FILE, "r") as f:
-                    return {line.strip() for line in f if line.strip()}
+                    return frozenset(name for line in f if (name := line.strip()))
         except Exception as e:
             logger.error(f"Error loading blacklist: {e}")
-        return set()
+        return frozenset()
 
-    def _resolve_mentions(self, message: discord.Message, content: str) -> str:
-        """Replace <@123456> style mentions with @username format."""
+    def _resolve_markup(self, message: discord.Message, content: str) -> str:
+        """Replace <@123456> mentions and <:emoji:123456> emojis in one pass."""
+        # Most messages contain no markup at all; skip the regex entirely
+        if "<" not in content:
+            return content
 
-        def replace_mention(match: re.Match[str]) -> str:
-            user_id = match.group(1)
+        mention_names = {user.id: user.name for user in message.mentions}
+
+        def replace_markup(match: re.Match[str]) -> str:
+            user_id, emoji_name = match.groups()
+            if emoji_name is not None:
+                return f":{emoji_name}:"
             # Try to find user in message mentions first
-            for user in message.mentions:
-                if str(user.id) == user_id:
-                    return f"@{user.name}"
+            uid = int(user_id)
+            name = mention_names.get(uid)
+            if name is not None:
+                return f"@{name}"
             # Fallback to getting user from bot's cache
-            user = self.bot.get_user(int(user_id))
+            user = self.bot.get_user(uid)
             return f"@{user.name if user else 'unknown'}"
 
-        return self.mention_pattern.sub(replace_mention, content)
-
-    def _resolve_emojis(self, content: str) -> str:
-        """Replace <:emoji:123456> style emojis with :emoji: format."""
-
-        def replace_emoji(match: re.Match[str]) -> str:
-            emoji_name = match.group(1)
-            return f":{emoji_name}:"
-
-        return self.emoji_pattern.sub(replace_emoji, content)
+        return self.markup_pattern.sub(replace_markup, content)
 
     def format_message_as_irc(self, message: discord.Message) -> str:
         """Format a Discord message as IRC log line"""
@@ -96,8 +161,7 @@ class IRCCompletionBot:
         content: str = message.content.strip()
 
         # Process mentions and emojis
-        content = self._resolve_mentions(message, content)
-        content = self._resolve_emojis(content)
+        content = self._resolve_markup(message, content)
 
         # Handle message references (replies)
         if message.reference and hasattr(message.reference, "resolved"):
@@ -108,29 +172,35 @@ class IRCCompletionBot:
                     referenced_msg.author.name if referenced_msg.author else "unknown"
                 )
                 ref_content = referenced_msg.content.strip()
-                ref_content = self._resolve_mentions(referenced_msg, ref_content)
-                ref_content = self._resolve_emojis(ref_content)
+                ref_content = self._resolve_markup(referenced_msg, ref_content)
 
                 # Return both the quote and the reply
                 return f"<{username}> > {ref_content}\n<{username}> @{ref_username} {content}"
 
-        # Handle multiline messages
+        # Handle multiline messages: drop blank lines, then prefix every line
         if "\n" in content:
-            lines: List[str] = content.split("\n")
-            return "\n".join(f"<{username}> {line}" for line in lines if line.strip())
+            content = BLANK_LINES_PATTERN.sub("\n", content)
+            # Escape backslashes so the username is inserted literally
+            prefix = f"<{username}> ".replace("\\", "\\\\")
+            return LINE_START_PATTERN.sub(prefix, content)
 
         return f"<{username}> {content}"
 
     def parse_irc_line(self, line: str) -> Tuple[Optional[str], Optional[str]]:
         """Parse an IRC-style line to extract username and message"""
-        match = re.match(r"^<([^>]+)>\s*(.*)$", line.strip())
-        if match:
-            username, message = match.group(1), match.group(2)
-            # Check if username is blacklisted
-            if username in self.blacklisted_users:
-                return DELETED_USER, CENSORED_TEXT
-            return username, message
-        return None, None
+        # Called for every streamed line, so slice instead of using a regex
+        line = line.strip()
+        if not line.startswith("<"):
+            return None, None
+        end = line.find(">")
+        if end <= 1:
+            return None, None
+
+        username, message = line[1:end], line[end + 1 :].lstrip()
+        # Check if username is blacklisted
+        if username in self.blacklisted_users:
+            return DELETED_USER, CENSORED_TEXT
+        return username, message
 
     async def get_webhook_for_channel(
         self, channel: MessageableChannel
@@ -142,37 +212,184 @@ class IRCCompletionBot:
             )
             return None
 
+        cached_webhook = self.webhook_cache.get(channel.id)
+        if cached_webhook is not None:
+            self.webhook_cache.move_to_end(channel.id)
+            return cached_webhook
+
         # If using a manual webhook URL
         if self.webhook_url:
-            if channel.id not in self.webhook_cache:
-                self.webhook_cache[channel.id] = discord.Webhook.from_url(
-                    self.webhook_url, client=self.bot
-                )
-            return self.webhook_cache[channel.id]
+            webhook_from_url = discord.Webhook.from_url(
+                self.webhook_url, client=self.bot
+            )
+            self._cache_webhook(channel.id, webhook_from_url)
+            return webhook_from_url
 
+        if self._webhook_recently_failed(channel.id):
+            return None
+
+        # Concurrent callers wait for a single lookup rather than each
+        # listing, and possibly creating, the channel's webhooks
+        lock = self.webhook_locks.setdefault(channel.id, asyncio.Lock())
+        async with lock:
+            cached_webhook = self.webhook_cache.get(channel.id)
+            if cached_webhook is not None:
+                return cached_webhook
+            if self._webhook_recently_failed(channel.id):
+                return None
+            return await self._fetch_webhook(channel)
+
+    def _webhook_recently_failed(self, channel_id: int) -> bool:
+        """Check whether a webhook lookup for the channel failed recently."""
+        failed_at = self.webhook_failures.get(channel_id)
+        if failed_at is None:
+            return False
+        if time.monotonic() - failed_at < WEBHOOK_RETRY_DELAY:
+            return True
+        del self.webhook_failures[channel_id]
+        return False
+
+    async def _fetch_webhook(
+        self, channel: discord.TextChannel
+    ) -> Optional[discord.Webhook]:
+        """Find the channel's webhook or create one, and cache it"""
         # Try to get existing webhook
         try:
             webhooks = await channel.webhooks()
-            webhook: Optional[discord.Webhook] = discord.utils.get(
-                webhooks, name="IRC Completion Bot"
+            # Only reuse a webhook this bot created, not another one that
+            # happens to share the name
+            bot_user = self.bot.user
+            webhook: Optional[discord.Webhook] = next(
+                (
+                    w
+                    for w in webhooks
+                    if w.name == WEBHOOK_NAME
+                    and w.user is not None
+                    and bot_user is not None
+                    and w.user.id == bot_user.id
+                ),
+                None,
             )
 
             if webhook:
-                self.webhook_cache[channel.id] = webhook
+                self._cache_webhook(channel.id, webhook)
                 return webhook
             else:
                 # Try to create one
-                webhook = await channel.create_webhook(name="IRC Completion Bot")
-                self.webhook_cache[channel.id] = webhook
+                webhook = await channel.create_webhook(name=WEBHOOK_NAME)
+                self._cache_webhook(channel.id, webhook)
                 logger.info(f"Created webhook for channel {channel.name}")
                 return webhook
         except discord.Forbidden:
             logger.error(f"No permission to access webhooks in {channel.name}")
+            # Don't ask Discord again for every message in this channel
+            self.webhook_failures[channel.id] = time.monotonic()
             return None
         except Exception as e:
             logger.error(f"Error with webhooks: {e}")
             return None
 
+    def _cache_webhook(self, channel_id: int, webhook: discord.Webhook) -> None:
+        """Cache a channel's webhook, evicting the least recently used ones."""
+        self.webhook_cache[channel_id] = webhook
+        self.webhook_cache.move_to_end(channel_id)
+        while len(self.webhook_cache) > WEBHOOK_CACHE_SIZE:
+            _, evicted = self.webhook_cache.popitem(last=False)
+            # A URL webhook is shared by every channel, so keep its limiter
+            # while any channel still uses it
+            if all(cached.id != evicted.id for cached in self.webhook_cache.values()):
+                self.webhook_limiters.pop(evicted.id, None)
+
+    def _forget_webhook(self, webhook: discord.Webhook) -> None:
+        """Drop a webhook from the cache so it is looked up again."""
+        for channel_id, cached in list(self.webhook_cache.items()):
+            if cached.id == webhook.id:
+                del self.webhook_cache[channel_id]
+        self.webhook_limiters.pop(webhook.id, None)
+
+    def _format_history_line(self, message: discord.Message) -> Optional[str]:
+        """Format a message for the history cache, or None to leave it out"""
+        # Skip messages that start with "-# " or are empty
+        if not message.content or message.content.startswith("-# "):
+            return None
+        return self.format_message_as_irc(message) or None
+
+    def record_message(self, message: discord.Message) -> None:
+        """Add a message to its channel's cached IRC history"""
+        irc_line = self._format_history_line(message)
+        if irc_line:
+            self.history_cache[message.channel.id].append((message.id, irc_line))
+
+    def _is_monitored_channel(self, channel_id: int) -> bool:
+        """Check whether a channel is the one this bot monitors"""
+        return (
+            self.monitored_channel_instance is not None
+            and channel_id == self.monitored_channel_instance.id
+        )
+
+    def handle_message_delete(self, channel_id: int, message_ids: Set[int]) -> None:
+        """Drop deleted messages from the monitored channel's cached history"""
+        if not self._is_monitored_channel(channel_id):
+            return
+
+        cache = self.history_cache.get(channel_id)
+        if not cache:
+            return
+        kept = [entry for entry in cache if entry[0] not in message_ids]
+        if len(kept) != len(cache):
+            cache.clear()
+            cache.extend(kept)
+
+    def handle_message_edit(self, message: discord.Message) -> None:
+        """Re-format an edited message in the monitored channel's cached history"""
+        if not self._is_monitored_channel(message.channel.id):
+            return
+
+        cache = self.history_cache.get(message.channel.id)
+        if not cache:
+            return
+        entries = [entry for entry in cache if entry[0] != message.id]
+        # An edit can also bring a previously skipped message into the
+        # history, as long as it falls within the cached range
+        irc_line = self._format_history_line(message)
+        if irc_line and message.id >= cache[0][0]:
+            entries.append((message.id, irc_line))
+            entries.sort(key=lambda entry: entry[0])
+        cache.clear()
+        cache.extend(entries)
+
+    async def _backfill_history(self, channel: discord.TextChannel) -> None:
+        """Fill the history cache for a channel from the Discord API once"""
+        if self.history_cache.get(channel.id):
+            return
+
+        try:
+            messages = [
+                message async for message in channel.history(limit=HISTORY_CACHE_SIZE)
+            ]
+        except discord.HTTPException as e:
+            logger.error(f"Error fetching history for {channel.name}: {e}")
+            return
+
+        # Messages may have been recorded while the fetch was in flight, so
+        # merge by id rather than appending the older fetched messages after
+        # them
+        cache = self.history_cache[channel.id]
+        cached_ids = {message_id for message_id, _ in cache}
+        merged = list(cache)
+        for message in messages:
+            if message.id in cached_ids:
+                continue
+            irc_line = self._format_history_line(message)
+            if irc_line:
+                merged.append((message.id, irc_line))
+        merged.sort(key=lambda entry: entry[0])
+        cache.clear()
+        cache.extend(merged)
+        logger.info(
+            f"Cached {len(self.history_cache[channel.id])} messages from {channel.name}"
+        )
+
     async def get_channel_history(
         self,
         channel: MessageableChannel,
@@ -180,76 +397,32 @@ class IRCCompletionBot:
         limit: int = 50,
     ) -> str:
         """Get recent channel history formatted as IRC log"""
-        channel_identifier = getattr(
-            channel, "name", str(getattr(channel, "id", "unknown"))
-        )
-        logger.info(
-            f"Fetching history for channel {channel_identifier} with limit {limit}"
-        )
-        if reference_message:
-            logger.info(
-                f"Reference message content: {reference_message.content[:100]}..."
-            )
-
-        messages: List[discord.Message] = []
-        if hasattr(channel, "history"):
-            # If we have a reference message, get messages before it
-            if reference_message:
-                logger.info("Using reference message to fetch history")
-                history_iterator = channel.history(
-                    limit=limit, before=reference_message
-                )
-            else:
-                logger.info("No reference message, fetching recent history")
-                history_iterator = channel.history(limit=limit)
-        else:
-            logger.warning(
-                f"Channel {getattr(channel, 'id', 'unknown channel')} of type {type(channel)} does not have history method or requires fetching."
-            )
-            return ""
-
-        message_count = 0
-        async for message_item in history_iterator:
-            message_count += 1
-            logger.debug(
-                f"Found message {message_count}: {message_item.content[:100]}..."
-            )
-
-            # Skip messages that start with "-# " or are empty
-            if message_item.content and not message_item.content.startswith("-# "):
-                messages.append(message_item)
-                logger.info(
-                    f"Added message {len(messages)}: {message_item.content[:100]}..."
-                )
-            else:
-                logger.debug(f"Skipped message: empty or starts with -# ")
-
+        channel_identifier = self._get_channel_identifier(channel)
         logger.info(
-            f"Found {message_count} total messages, kept {len(messages)} messages"
+            f"Building history for channel {channel_identifier} with limit {limit}"
         )
 
-        # Reverse to get chronological order
-        messages.reverse()
+        cached = self.history_cache.get(getattr(channel, "id", 0), ())
 
-        # Add the reference message at the end if it has content and doesn't start with "-# "
-        if (
-            reference_message
-            and reference_message.content
-            and not reference_message.content.startswith("-# ")
-        ):
-            messages.append(reference_message)
-            logger.info("Added reference message to history")
-
-        # Format as IRC
+        # Only messages before the reference message count as history, like
+        # fetching history(before=reference_message); the reference message
+        # itself goes at the end
         irc_lines: List[str] = []
-        for msg in messages:
-            irc_line = self.format_message_as_irc(msg)
-            if irc_line:
+        reference_line: Optional[str] = None
+        for message_id, irc_line in cached:
+            if reference_message is None or message_id < reference_message.id:
                 irc_lines.append(irc_line)
+            elif message_id == reference_message.id:
+                reference_line = irc_line
+
+        irc_lines = irc_lines[-limit:] if limit > 0 else []
+        if reference_line:
+            irc_lines.append(reference_line)
+            logger.info("Added reference message to history")
 
         formatted_history = "\n".join(irc_lines) + "\n"
         logger.info(f"Final formatted history has {len(irc_lines)} lines")
-        logger.debug(f"Formatted history:\n{formatted_history}")
+        logger.debug("Formatted history:\n%s", formatted_history)
 
         return formatted_history
 
@@ -257,20 +430,59 @@ class IRCCompletionBot:
         """Get a human-readable identifier for a channel."""
         return getattr(channel, "name", str(getattr(channel, "id", "unknown")))
 
-    async def _clear_bot_status(self) -> None:
+    def _clear_bot_status(self) -> None:
         """Clear the bot's current status."""
-        await self.bot.change_presence(activity=None)
+        self._request_bot_status(None)
 
-    async def _set_bot_status(self, username: str) -> None:
+    def _set_bot_status(self, username: str) -> None:
         """Set the bot's status to show current username."""
-        await self.bot.change_presence(activity=discord.Game(username))
+        self._request_bot_status(username)
+
+    def _request_bot_status(self, username: Optional[str]) -> None:
+        """Update the bot's status in the background if it has changed.
+
+        The stream loop never waits on the gateway; rapid changes collapse
+        into a single update to the latest username.
+        """
+        if username == self.bot_status:
+            return
+        self.bot_status = username
+        if self.bot_status_task is None or self.bot_status_task.done():
+            self.bot_status_task = asyncio.create_task(self._push_bot_status())
+
+    async def _push_bot_status(self) -> None:
+        """Send the requested status to Discord until it is up to date."""
+        while True:
+            username = self.bot_status
+            try:
+                await self.bot.change_presence(
+                    activity=discord.Game(username) if username else None
+                )
+            except Exception as e:
+                logger.error(f"Error updating bot status: {e}")
+                if self.bot_status == username:
+                    # Nothing newer was requested; fall back to what is
+                    # actually shown so asking for this status again retries
+                    self.bot_status = self.shown_bot_status
+                    return
+                continue
+            self.shown_bot_status = username
+            if self.bot_status == username:
+                return
+
+    def _get_webhook_limiter(self, webhook: discord.Webhook) -> WebhookRateLimiter:
+        """Get the rate limiter for a webhook, creating it on first use."""
+        limiter = self.webhook_limiters.get(webhook.id)
+        if limiter is None:
+            limiter = WebhookRateLimiter(WEBHOOK_RATE_LIMIT, WEBHOOK_RATE_PERIOD)
+            self.webhook_limiters[webhook.id] = limiter
+        return limiter
 
     async def _send_webhook_message(
         self,
         webhook: discord.Webhook,
         message_content: str,
         username: str,
-        completion_data: ActiveCompletion,
     ) -> None:
         """Send a message via webhook with proper blacklist checking."""
         if username in self.blacklisted_users:
@@ -280,8 +492,67 @@ class IRCCompletionBot:
         await webhook.send(
             content=message_content,
             username=username,
-            wait=True,
+            wait=False,
         )
+
+    async def _drain_webhook_queue(
+        self,
+        webhook: discord.Webhook,
+        send_queue: asyncio.Queue[Optional[Tuple[str, str]]],
+    ) -> None:
+        """Send queued (username, message) pairs in order until None is queued.
+
+        Consecutive lines from the same user that are already waiting once a
+        send is allowed go out together as one message.
+        """
+        limiter = self._get_webhook_limiter(webhook)
+        item = await send_queue.get()
+        while item is not None:
+            username, message_content = item
+            await limiter.acquire()
+
+            next_item: Optional[Tuple[str, str]] = None
+            has_next_item = False
+            while not send_queue.empty():
+                queued = send_queue.get_nowait()
+                if (
+                    queued is not None
+                    and queued[0] == username
+                    and len(message_content) + 1 + len(queued[1])
+                    <= WEBHOOK_MESSAGE_LENGTH_LIMIT
+                ):
+                    message_content += "\n" + queued[1]
+                else:
+                    next_item = queued
+                    has_next_item = True
+                    break
+
+            try:
+                await self._send_webhook_message(webhook, message_content, username)
+            except discord.NotFound:
+                # The webhook was deleted; look it up again next completion.
+                # Every remaining line would fail the same way, so discard
+                # them, still reading up to None so the producer never blocks
+                logger.error(f"Webhook {webhook.id} no longer exists")
+                self._forget_webhook(webhook)
+                item = next_item if has_next_item else await send_queue.get()
+                while item is not None:
+                    item = await send_queue.get()
+                return
+            except Exception as e:
+                logger.error(f"Error sending webhook message as {username}: {e}")
+
+            item = next_item if has_next_item else await send_queue.get()
+
+    async def _queue_webhook_message(
+        self,
+        send_queue: asyncio.Queue[Optional[Tuple[str, str]]],
+        message_content: str,
+        username: str,
+        completion_data: ActiveCompletion,
+    ) -> None:
+        """Queue a message for the webhook sender and count it."""
+        await send_queue.put((username, message_content))
         completion_data.message_count += 1
 
     def _check_message_limit(self, completion_data: ActiveCompletion) -> bool:
@@ -310,6 +581,13 @@ class IRCCompletionBot:
             )
             return
 
+        # Lines are sent by a separate task so Discord round trips overlap
+        # with generation; a single sender keeps them in order
+        send_queue: asyncio.Queue[Optional[Tuple[str, str]]] = asyncio.Queue(
+            maxsize=WEBHOOK_SEND_QUEUE_SIZE
+        )
+        sender = asyncio.create_task(self._drain_webhook_queue(webhook, send_queue))
+
         try:
             stream = await self.api_client.generate(
                 model=self.ollama_model,
@@ -318,6 +596,7 @@ class IRCCompletionBot:
             )
 
             current_line: str = ""
+            line_username_checked = False
             messages_sent_this_stream = 0
 
             async for chunk in stream:
@@ -327,74 +606,76 @@ class IRCCompletionBot:
                             f"Message limit ({self.max_messages_per_interaction}) reached for channel {current_op_channel_id}."
                         )
                         if current_username:
-                            await self._clear_bot_status()
+                            self._clear_bot_status()
                         break
 
-                    if "response" in chunk:
-                        current_line += chunk["response"]
-
-                        # Check for complete username in current line
-                        if "<" in current_line and ">" in current_line:
-                            username_match = re.match(r"^<([^>]+)>", current_line)
-                            if username_match:
-                                new_username = username_match.group(1).strip()
+                    text = chunk.get("response")
+                    if text is not None:
+                        done = chunk.get("done", False)
+                        # A trailing newline on the last chunk sends the final
+                        # partial line through the normal line parsing below
+                        if done:
+                            text += "\n"
+                        current_line += text
+
+                        # Check for complete username in current line, once
+                        # per line
+                        if not line_username_checked and current_line.startswith("<"):
+                            end = current_line.find(">")
+                            if end > 1:
+                                line_username_checked = True
+                                new_username = current_line[1:end].strip()
                                 if new_username != current_username:
                                     current_username = new_username
-                                    await self._set_bot_status(current_username)
-
-                        if "\n" in current_line:
-                            lines = current_line.split("\n")
-                            for i in range(len(lines) - 1):
-                                if self._check_message_limit(completion_data):
+                                    self._set_bot_status(current_username)
+
+                        # Only the new text can complete a line. Walk the
+                        # line breaks with find and slice the tail off once,
+                        # rather than splitting the whole buffer.
+                        if "\n" in text:
+                            start = 0
+                            while not self._check_message_limit(completion_data):
+                                newline = current_line.find("\n", start)
+                                if newline < 0:
                                     break
 
-                                complete_line = lines[i].strip()
+                                complete_line = current_line[start:newline].strip()
+                                start = newline + 1
                                 if complete_line:
                                     username, message_content = self.parse_irc_line(
                                         complete_line
                                     )
                                     if username and message_content:
-                                        await self._send_webhook_message(
-                                            webhook,
+                                        await self._queue_webhook_message(
+                                            send_queue,
                                             message_content,
                                             username,
                                             completion_data,
                                         )
                                         messages_sent_this_stream += 1
-                                        await asyncio.sleep(0.5)
-
-                            current_line = lines[-1]
-
-                        if chunk.get("done", False):
-                            if current_line.strip() and not self._check_message_limit(
-                                completion_data
-                            ):
-                                username, message_content = self.parse_irc_line(
-                                    current_line
-                                )
-                                if username and message_content:
-                                    await self._send_webhook_message(
-                                        webhook,
-                                        message_content,
-                                        username,
-                                        completion_data,
-                                    )
-                                    messages_sent_this_stream += 1
+
+                            if start:
+                                current_line = current_line[start:]
+                                line_username_checked = False
+
+                        if done:
                             if current_username:
-                                await self._clear_bot_status()
+                                self._clear_bot_status()
                             break
                 except asyncio.CancelledError:
                     logger.info(
                         f"Stream processing cancelled for channel {current_op_channel_id}"
                     )
                     if current_username:
-                        await self._clear_bot_status()
+                        self._clear_bot_status()
                     raise
 
-            if (
-                messages_sent_this_stream == 0
-                and hasattr(channel, "send")
-                and not self._check_message_limit(completion_data)
+            # Let the sender finish everything already queued
+            await send_queue.put(None)
+            await sender
+
+            if messages_sent_this_stream == 0 and not self._check_message_limit(
+                completion_data
             ):
                 await channel.send(
                     "No valid IRC-style responses were generated in this segment."
@@ -406,18 +687,25 @@ class IRCCompletionBot:
         except Exception as e:
             logger.error(f"Error generating completion: {e}")
             if current_username:
-                await self._clear_bot_status()
-            if hasattr(channel, "send"):
-                await channel.send(f"Error during Ollama generation: {e}")
+                self._clear_bot_status()
+            # Lines parsed before the failure still go out, ahead of the error
+            if not sender.done():
+                await send_queue.put(None)
+                await sender
+            await channel.send(f"Error during Ollama generation: {e}")
+        finally:
+            # Drop unsent lines if the completion was cancelled
+            if not sender.done():
+                sender.cancel()
 
     async def initialize(self) -> None:
         """Initialize the IRC completion bot after the main bot is ready."""
-        found_channels: List[discord.TextChannel] = []
-        for guild in self.bot.guilds:
-            text_channels: List[discord.TextChannel] = guild.text_channels
-            for channel in text_channels:
-                if channel.name == self.monitored_channel_name:
-                    found_channels.append(channel)
+        found_channels: List[discord.TextChannel] = [
+            channel
+            for guild in self.bot.guilds
+            for channel in guild.text_channels
+            if channel.name == self.monitored_channel_name
+        ]
 
         if not found_channels:
             logger.warning(
@@ -429,8 +717,10 @@ class IRCCompletionBot:
             logger.info(
                 f"Monitoring single channel: {self.monitored_channel_instance.name} (ID: {self.monitored_channel_instance.id}) in guild '{self.monitored_channel_instance.guild.name}'"
             )
-            webhook = await self.get_webhook_for_channel(
-                self.monitored_channel_instance
+            # Both are independent REST calls, so run them concurrently
+            _, webhook = await asyncio.gather(
+                self._backfill_history(self.monitored_channel_instance),
+                self.get_webhook_for_channel(self.monitored_channel_instance),
             )
             if webhook:
                 logger.info(
@@ -450,7 +740,16 @@ class IRCCompletionBot:
 
     async def handle_message(self, message: discord.Message) -> None:
         """Handle a message in the monitored channel"""
-        if message.author.bot or self.monitored_channel_instance is None:
+        if (
+            self.monitored_channel_instance is None
+            or message.channel.id != self.monitored_channel_instance.id
+        ):
+            return
+
+        # Every message in the channel is history, including webhook output
+        self.record_message(message)
+
+        if message.author.bot:
             return
 
         if message.content.startswith("-# "):
@@ -459,75 +758,71 @@ class IRCCompletionBot:
             )
             return
 
-        if message.channel.id == self.monitored_channel_instance.id:
-            current_channel_id = message.channel.id
-            channel_name = self.monitored_channel_instance.name
+        current_channel_id = message.channel.id
+        channel_name = self.monitored_channel_instance.name
 
+        logger.info(
+            f"Processing message in channel {channel_name}: {message.content[:100]}..."
+        )
+
+        # Capture the state that this on_message invocation will create and manage.
+        this_invocation_completion_state = ActiveCompletion(
+            channel_id=current_channel_id,
+            message_count=0,
+        )
+
+        if (
+            self.active_completion_state is not None
+            and self.active_completion_state.channel_id == current_channel_id
+        ):
             logger.info(
-                f"Processing message in channel {channel_name}: {message.content[:100]}..."
+                f"New message in monitored channel {channel_name} while bot is active. Cancelling previous task."
             )
+            # Cancel the task without waiting for it to unwind; the
+            # handler that started it awaits it and handles the
+            # cancellation, and it runs its cleanup before the new
+            # completion gets going
+            if self.active_completion_state.task:
+                self.active_completion_state.task.cancel()
 
-            # Capture the state that this on_message invocation will create and manage.
-            this_invocation_completion_state = ActiveCompletion(
-                channel_id=current_channel_id,
-                message_count=0,
-            )
+        logger.info(
+            f"Setting up new completion for channel {channel_name} (ID: {current_channel_id})"
+        )
+        self.active_completion_state = this_invocation_completion_state
 
-            if (
-                self.active_completion_state is not None
-                and self.active_completion_state.channel_id == current_channel_id
-            ):
-                logger.info(
-                    f"New message in monitored channel {channel_name} while bot is active. Cancelling previous task."
-                )
-                # Cancel the task
-                if self.active_completion_state.task:
-                    old_task = self.active_completion_state.task
-                    old_task.cancel()
-                    try:
-                        await old_task
-                    except asyncio.CancelledError:
-                        pass
+        current_channel: MessageableChannel = message.channel
 
-            logger.info(
-                f"Setting up new completion for channel {channel_name} (ID: {current_channel_id})"
+        try:
+            history = await self.get_channel_history(
+                current_channel,
+                reference_message=message,
+                limit=MESSAGE_HISTORY_LIMIT,
             )
-            self.active_completion_state = this_invocation_completion_state
 
-            current_channel: MessageableChannel = message.channel
-
-            try:
-                history = await self.get_channel_history(
-                    current_channel,
-                    reference_message=message,
-                    limit=MESSAGE_HISTORY_LIMIT,
-                )
+            # Create and store the task
+            completion_task = asyncio.create_task(
+                self.stream_ollama_completion(history, current_channel)
+            )
+            this_invocation_completion_state.task = completion_task
+            await completion_task
 
-                # Create and store the task
-                completion_task = asyncio.create_task(
-                    self.stream_ollama_completion(history, current_channel)
+        except asyncio.CancelledError:
+            logger.info(f"Completion task was cancelled for channel {channel_name}")
+        except Exception as e:
+            logger.error(
+                f"Error processing message in {channel_name}: {e}", exc_info=True
+            )
+            await current_channel.send(f"Error generating completion: {str(e)}")
+        finally:
+            # Only clear the global state if it's the exact same state object
+            # that this specific on_message invocation created and managed.
+            if self.active_completion_state is this_invocation_completion_state:
+                logger.info(
+                    f"Completion attempt for this message context ended for channel {channel_name} (ID: {current_channel_id})."
                 )
-                this_invocation_completion_state.task = completion_task
-                await completion_task
-
-            except asyncio.CancelledError:
-                logger.info(f"Completion task was cancelled for channel {channel_name}")
-            except Exception as e:
-                logger.error(
-                    f"Error processing message in {channel_name}: {e}", exc_info=True
+                self.active_completion_state = None
+            else:
+                logger.info(
+                    f"Completion attempt for this message context concluded for channel {channel_name} (ID: {current_channel_id}), "
+                    f"but active_completion_state was already changed or cleared by a newer message. No action taken on state by this finally block."
                 )
-                if hasattr(current_channel, "send"):
-                    await current_channel.send(f"Error generating completion: {str(e)}")
-            finally:
-                # Only clear the global state if it's the exact same state object
-                # that this specific on_message invocation created and managed.
-                if self.active_completion_state is this_invocation_completion_state:
-                    logger.info(
-                        f"Completion attempt for this message context ended for channel {channel_name} (ID: {current_channel_id})."
-                    )
-                    self.active_completion_state = None
-                else:
-                    logger.info(
-                        f"Completion attempt for this message context concluded for channel {channel_name} (ID: {current_channel_id}), "
-                        f"but active_completion_state was already changed or cleared by a newer message. No action taken on state by this finally block."
-                    )
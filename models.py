@@ -3,7 +3,16 @@
 from datetime import UTC, datetime
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -378,3 +387,14 @@ class MessageMention(Base):
     user_id: Mapped[str] = mapped_column(
         String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
     )
+
+
+class ImportLog(Base):
+    """SQLAlchemy model for JSON export files already imported."""
+
+    __tablename__ = "import_log"
+
+    path: Mapped[str] = mapped_column(String, primary_key=True)
+    mtime: Mapped[float] = mapped_column(Float)
+    sha256: Mapped[str] = mapped_column(String)
+    rows_imported: Mapped[int] = mapped_column(Integer)
@@ -0,0 +1,66 @@
+"""Tests for the example conversation file."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import example_conversation
+from example_conversation import MessagePair
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Run each test in an empty directory, where the conversation files live."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_legacy_json_file_is_converted(in_tmp_path: Path) -> None:
+    """Test that an existing JSON array file is converted to JSON lines."""
+    legacy_path = in_tmp_path / example_conversation.LEGACY_EXAMPLE_CONVERSATION_FILE
+    legacy_path.write_text(
+        json.dumps(
+            [
+                {"user": "hi", "assistant": "hello"},
+                {"user": "bye", "assistant": "goodbye"},
+            ]
+        )
+    )
+
+    assert example_conversation.count_pairs() == 2
+    assert example_conversation.load_pairs() == [
+        MessagePair(user="hi", assistant="hello"),
+        MessagePair(user="bye", assistant="goodbye"),
+    ]
+    lines = (
+        (in_tmp_path / example_conversation.EXAMPLE_CONVERSATION_FILE)
+        .read_text()
+        .splitlines()
+    )
+    assert [json.loads(line) for line in lines] == [
+        {"user": "hi", "assistant": "hello"},
+        {"user": "bye", "assistant": "goodbye"},
+    ]
+
+
+def test_add_pair_appends_a_line(in_tmp_path: Path) -> None:
+    """Test that adding a pair appends to the file without rewriting it."""
+    example_conversation.add_pair("one", "1")
+    path = in_tmp_path / example_conversation.EXAMPLE_CONVERSATION_FILE
+    first_line = path.read_bytes()
+
+    example_conversation.add_pair("two\nlines", "2")
+
+    assert path.read_bytes().startswith(first_line)
+    assert example_conversation.count_pairs() == 2
+    assert example_conversation.load_pairs() == [
+        MessagePair(user="one", assistant="1"),
+        MessagePair(user="two\nlines", assistant="2"),
+    ]
+
+
+def test_missing_file_counts_as_empty() -> None:
+    """Test that a conversation with no file yet has no pairs."""
+    assert example_conversation.count_pairs() == 0
+    assert example_conversation.load_pairs() == []
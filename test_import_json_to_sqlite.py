@@ -0,0 +1,272 @@
+"""Tests for importing JSON message exports into SQLite."""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy import Engine, create_engine, select
+
+from import_json_to_sqlite import (
+    ImportBuffers,
+    import_channel_data,
+    import_data,
+    load_json_file,
+)
+from models import Base, Message
+
+
+def make_message(message_id: str, **extra: Any) -> Dict[str, Any]:
+    """Build a minimal exported message."""
+    message: Dict[str, Any] = {
+        "id": message_id,
+        "timestamp": "2024-01-01T00:00:00+00:00",
+        "content": f"message {message_id}",
+        "author": {"id": "u1", "name": "alice"},
+    }
+    message.update(extra)
+    return message
+
+
+def make_export(channel_id: str, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build a minimal exported channel file."""
+    return {
+        "guild": {"id": "g1"},
+        "channel": {"id": channel_id, "type": "GuildTextChat", "name": channel_id},
+        "messages": messages,
+    }
+
+
+def query(db_path: Path, sql: str) -> List[Any]:
+    """Run a query against the database with the raw driver."""
+    with sqlite3.connect(db_path) as db:
+        return db.execute(sql).fetchall()
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    """Path of an empty database file."""
+    return tmp_path / "messages.sqlite"
+
+
+@pytest.fixture
+def engine(db_path: Path) -> Engine:
+    """Engine for a database with all tables created."""
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def test_embed_and_reaction_ids_link_children(engine: Engine, db_path: Path) -> None:
+    """Test that generated parent IDs are used by their child rows."""
+    embed = {"title": "e", "fields": [{"name": "n", "value": "v"}]}
+    reaction = {
+        "emoji": {"name": "x", "code": "x"},
+        "count": 2,
+        "users": [{"id": "u1"}, {"id": "u2"}, {"id": "u1"}],
+    }
+    with engine.connect() as conn:
+        import_channel_data(
+            conn,
+            make_export(
+                "c1",
+                [
+                    make_message("1", embeds=[embed], reactions=[reaction]),
+                    make_message("2", embeds=[embed, embed]),
+                ],
+            ),
+        )
+        # A later file continues from the IDs already in the database
+        import_channel_data(
+            conn, make_export("c2", [make_message("3", embeds=[embed])])
+        )
+
+    assert query(db_path, "SELECT id, message_id FROM embeds ORDER BY id") == [
+        (1, "1"),
+        (2, "2"),
+        (3, "2"),
+        (4, "3"),
+    ]
+    assert query(db_path, "SELECT embed_id FROM embed_fields ORDER BY embed_id") == [
+        (1,),
+        (2,),
+        (3,),
+        (4,),
+    ]
+    assert query(
+        db_path, "SELECT reaction_id, user_id FROM reaction_users ORDER BY user_id"
+    ) == [(1, "u1"), (1, "u2")]
+
+
+def test_rolled_back_users_are_not_marked_known(engine: Engine) -> None:
+    """Test that users only count as inserted once their batch commits."""
+    with engine.connect() as conn:
+        buffers = ImportBuffers.for_connection(conn)
+        assert buffers.add_user({"id": "u1", "name": "alice"})
+
+        buffers.flush(conn)
+        conn.rollback()
+        buffers.clear()
+
+        assert "u1" not in buffers.known_user_ids
+        assert buffers.add_user({"id": "u1", "name": "alice"})
+
+        buffers.flush(conn)
+        conn.commit()
+        buffers.mark_committed()
+
+        assert "u1" in buffers.known_user_ids
+        assert not buffers.add_user({"id": "u1", "name": "alice"})
+
+
+def test_timestamps_read_back_through_the_orm(engine: Engine) -> None:
+    """Test that timestamps written by the raw driver load as datetimes."""
+    with engine.connect() as conn:
+        import_channel_data(
+            conn,
+            make_export(
+                "c1",
+                [
+                    make_message(
+                        "1",
+                        timestamp="2024-01-02T03:04:05.678+00:00",
+                        timestampEdited="2024-01-02T04:00:00+00:00",
+                    ),
+                    make_message("2"),
+                ],
+            ),
+        )
+        rows = conn.execute(
+            select(
+                Message.timestamp,
+                Message.timestamp_edited,
+                Message.call_ended_timestamp,
+            ).order_by(Message.id)
+        ).all()
+
+    assert [tuple(row) for row in rows] == [
+        (datetime(2024, 1, 2, 3, 4, 5, 678000), datetime(2024, 1, 2, 4), None),
+        (datetime(2024, 1, 1), None, None),
+    ]
+
+
+def test_messages_stored_under_another_channel_are_skipped(
+    engine: Engine, db_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a message ID from another channel does not fail the batch."""
+    with engine.connect() as conn:
+        import_channel_data(conn, make_export("c1", [make_message("1")]))
+
+        def no_retry(*args: Any) -> None:
+            raise AssertionError("batch should not have failed")
+
+        monkeypatch.setattr("import_json_to_sqlite.retry_message_batch", no_retry)
+        messages, users = import_channel_data(
+            conn,
+            make_export(
+                "c2",
+                [
+                    make_message("1", embeds=[{"title": "stray"}]),
+                    make_message("2", author={"id": "u2", "name": "bob"}),
+                ],
+            ),
+        )
+
+    assert (messages, users) == (1, 1)
+    assert query(db_path, "SELECT id, channel_id FROM messages ORDER BY id") == [
+        ("1", "c1"),
+        ("2", "c2"),
+    ]
+    assert query(db_path, "SELECT COUNT(*) FROM embeds") == [(0,)]
+
+
+def test_failed_batch_reuses_embed_ids(engine: Engine, db_path: Path) -> None:
+    """Test that IDs handed out to a rolled-back batch are assigned again."""
+    embed = {"title": "e"}
+    with engine.connect() as conn:
+        import_channel_data(
+            conn,
+            make_export(
+                "c1",
+                [
+                    make_message("1", embeds=[embed]),
+                    make_message("2", timestamp="not a timestamp"),
+                    make_message("3", embeds=[embed]),
+                ],
+            ),
+        )
+
+    assert query(db_path, "SELECT id, message_id FROM embeds ORDER BY id") == [
+        (1, "1"),
+        (2, "3"),
+    ]
+
+
+def test_failed_batch_retries_messages_one_at_a_time(
+    engine: Engine, db_path: Path
+) -> None:
+    """Test that a bad message is skipped without losing the rest of its batch."""
+    with engine.connect() as conn:
+        messages, users = import_channel_data(
+            conn,
+            make_export(
+                "c1",
+                [
+                    make_message("1"),
+                    make_message(
+                        "2",
+                        timestamp="not a timestamp",
+                        author={"id": "u3", "name": "carol"},
+                        embeds=[{"title": "stray"}],
+                    ),
+                    make_message("3", author={"id": "u2", "name": "bob"}),
+                ],
+            ),
+        )
+
+    assert (messages, users) == (2, 2)
+    assert query(db_path, "SELECT id FROM messages ORDER BY id") == [("1",), ("3",)]
+    # Nothing from the rejected message is left behind
+    assert query(db_path, "SELECT COUNT(*) FROM embeds") == [(0,)]
+    assert query(db_path, "SELECT id FROM users ORDER BY id") == [("u1",), ("u2",)]
+
+
+def test_unchanged_files_are_not_reimported(tmp_path: Path, db_path: Path) -> None:
+    """Test that the import log skips files whose fingerprint is unchanged."""
+    data_dir = tmp_path / "exports"
+    data_dir.mkdir()
+    export_path = data_dir / "c1.json"
+    export_path.write_text(json.dumps(make_export("c1", [make_message("1")])))
+
+    import_data(str(data_dir), str(db_path))
+    assert query(db_path, "SELECT path, rows_imported FROM import_log") == [
+        (str(export_path), 1)
+    ]
+
+    # Remove the row behind the importer's back; an unchanged file is skipped
+    # so the row stays missing
+    query(db_path, "DELETE FROM messages")
+    import_data(str(data_dir), str(db_path))
+    assert query(db_path, "SELECT COUNT(*) FROM messages") == [(0,)]
+
+    # A new modification time makes the file eligible again
+    stat = os.stat(export_path)
+    os.utime(export_path, (stat.st_atime, stat.st_mtime + 10))
+    import_data(str(data_dir), str(db_path))
+    assert query(db_path, "SELECT COUNT(*) FROM messages") == [(1,)]
+
+
+def test_invalid_messages_are_dropped_on_load(tmp_path: Path) -> None:
+    """Test that messages missing required fields never reach the importer."""
+    export_path = tmp_path / "c1.json"
+    export_path.write_text(
+        json.dumps(make_export("c1", [make_message("1"), {"content": "no id"}]))
+    )
+
+    data = load_json_file(str(export_path))
+
+    assert data is not None
+    assert [message["id"] for message in data["messages"]] == ["1"]
@@ -0,0 +1,312 @@
+"""Tests for the liminal IRC completion bot."""
+
+# pylint: disable=protected-access
+
+import asyncio
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from unittest.mock import AsyncMock, Mock
+
+import discord
+import pytest
+
+from liminal import (
+    CENSORED_TEXT,
+    DELETED_USER,
+    ActiveCompletion,
+    IRCCompletionBot,
+    WebhookRateLimiter,
+)
+
+CHANNEL_ID = 1
+
+
+def make_message(
+    message_id: int, username: str, content: str, channel_id: int = CHANNEL_ID
+) -> Mock:
+    """Build a plain text Discord message."""
+    message = Mock(spec=discord.Message)
+    message.id = message_id
+    message.content = content
+    message.author.name = username
+    message.author.bot = False
+    message.channel.id = channel_id
+    message.reference = None
+    message.mentions = []
+    return message
+
+
+class FakeWebhook:
+    """Webhook that records sends, optionally failing every one of them."""
+
+    def __init__(self, error: Optional[Exception] = None) -> None:
+        self.id = 1
+        self.error = error
+        self.sent: List[Tuple[str, str]] = []
+
+    async def send(self, content: str, username: str, wait: bool) -> None:
+        """Record a send, or raise the configured error."""
+        self.sent.append((username, content))
+        if self.error:
+            raise self.error
+
+
+class FakeChannel:
+    """Channel whose history fetch waits until released."""
+
+    def __init__(self, messages: List[Mock]) -> None:
+        self.id = CHANNEL_ID
+        self.name = "shoggoth"
+        self.messages = messages
+        self.released = asyncio.Event()
+
+    async def history(self, limit: int) -> AsyncIterator[Mock]:
+        """Yield the messages newest first, like the Discord API."""
+        await self.released.wait()
+        for message in sorted(self.messages, key=lambda m: m.id, reverse=True):
+            yield message
+
+
+@pytest.fixture
+def irc_bot() -> IRCCompletionBot:
+    """IRC completion bot with a mocked Discord client and Ollama client."""
+    bot = Mock()
+    bot.change_presence = AsyncMock()
+    return IRCCompletionBot(bot, Mock())
+
+
+async def drain(
+    irc_bot: IRCCompletionBot,
+    webhook: FakeWebhook,
+    items: List[Tuple[str, str]],
+) -> "asyncio.Queue[Optional[Tuple[str, str]]]":
+    """Queue items and a terminating None, then run the sender to completion."""
+    send_queue: "asyncio.Queue[Optional[Tuple[str, str]]]" = asyncio.Queue()
+    for item in items:
+        send_queue.put_nowait(item)
+    send_queue.put_nowait(None)
+    await irc_bot._drain_webhook_queue(webhook, send_queue)  # type: ignore[arg-type]
+    return send_queue
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "<alice> hello",
+        "  <bob>   spaced out  ",
+        "<carol>no space",
+        "<dave>",
+        "<e> <f> nested",
+        "<back\\slash> escaped",
+        "<> empty name",
+        "<unterminated hello",
+        "plain text",
+        "",
+        " > <x> late",
+    ],
+)
+def test_parse_irc_line_matches_regex(irc_bot: IRCCompletionBot, line: str) -> None:
+    """Test that slicing parses lines exactly like the original regex."""
+    match = re.match(r"^<([^>]+)>\s*(.*)$", line.strip())
+    expected = (match.group(1), match.group(2)) if match else (None, None)
+
+    assert irc_bot.parse_irc_line(line) == expected
+
+
+def test_parse_irc_line_censors_blacklisted_users(irc_bot: IRCCompletionBot) -> None:
+    """Test that blacklisted usernames are replaced."""
+    irc_bot.blacklisted_users = frozenset({"troll"})
+
+    assert irc_bot.parse_irc_line("<troll> hi") == (DELETED_USER, CENSORED_TEXT)
+
+
+@pytest.mark.parametrize("username", ["alice", "back\\slash", "g\\1", "\\\\"])
+@pytest.mark.parametrize(
+    "content",
+    [
+        "one line",
+        "first\nsecond",
+        "  padded\n\n\nlines  ",
+        "a\n \t\n  indented\n\r\nb",
+        "trailing\n   ",
+    ],
+)
+def test_format_multiline_matches_joined_lines(
+    irc_bot: IRCCompletionBot, username: str, content: str
+) -> None:
+    """Test that the regex prefixing matches joining the non-blank lines."""
+    lines = content.strip().split("\n")
+    expected = "\n".join(f"<{username}> {line}" for line in lines if line.strip())
+
+    formatted = irc_bot.format_message_as_irc(make_message(1, username, content))
+
+    assert formatted == expected
+
+
+@pytest.mark.asyncio
+async def test_sender_joins_consecutive_lines_from_one_user(
+    irc_bot: IRCCompletionBot,
+) -> None:
+    """Test that queued lines from the same user go out as one message."""
+    webhook = FakeWebhook()
+
+    await drain(
+        irc_bot,
+        webhook,
+        [("alice", "one"), ("alice", "two"), ("bob", "three"), ("alice", "four")],
+    )
+
+    assert webhook.sent == [("alice", "one\ntwo"), ("bob", "three"), ("alice", "four")]
+
+
+@pytest.mark.asyncio
+async def test_sender_stops_when_webhook_is_gone(irc_bot: IRCCompletionBot) -> None:
+    """Test that a deleted webhook is tried once and the rest discarded."""
+    webhook = FakeWebhook(discord.NotFound(Mock(status=404, reason="Not Found"), ""))
+    irc_bot.webhook_cache[CHANNEL_ID] = webhook  # type: ignore[assignment]
+
+    send_queue = await drain(irc_bot, webhook, [("alice", "one"), ("bob", "two")])
+
+    assert webhook.sent == [("alice", "one")]
+    assert send_queue.empty()
+    assert CHANNEL_ID not in irc_bot.webhook_cache
+
+
+@pytest.mark.asyncio
+async def test_stream_error_still_sends_parsed_lines(
+    irc_bot: IRCCompletionBot,
+) -> None:
+    """Test that lines parsed before an Ollama failure are still posted."""
+
+    async def failing_stream() -> AsyncIterator[Dict[str, Any]]:
+        yield {"response": "<alice> one\n<bob> two\n", "done": False}
+        raise RuntimeError("connection lost")
+
+    webhook = FakeWebhook()
+    channel = Mock()
+    channel.send = AsyncMock()
+    irc_bot.get_webhook_for_channel = AsyncMock(return_value=webhook)  # type: ignore[method-assign]
+    irc_bot.api_client.generate = AsyncMock(return_value=failing_stream())  # type: ignore[method-assign]
+    irc_bot.active_completion_state = ActiveCompletion(
+        channel_id=CHANNEL_ID, message_count=0
+    )
+
+    await irc_bot.stream_ollama_completion("prompt", channel)
+
+    assert webhook.sent == [("alice", "one"), ("bob", "two")]
+    channel.send.assert_awaited_once_with(
+        "Error during Ollama generation: connection lost"
+    )
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_waits_once_tokens_run_out() -> None:
+    """Test that the limiter allows a burst, then spaces out sends."""
+    limiter = WebhookRateLimiter(rate=2, period=0.2)
+
+    start = time.monotonic()
+    await limiter.acquire()
+    await limiter.acquire()
+    burst = time.monotonic() - start
+    await limiter.acquire()
+    total = time.monotonic() - start
+
+    assert burst < 0.05
+    assert total >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_backfill_merges_messages_recorded_meanwhile(
+    irc_bot: IRCCompletionBot,
+) -> None:
+    """Test that history stays in order when messages arrive mid-backfill."""
+    channel = FakeChannel([make_message(i, "alice", f"m{i}") for i in (1, 2, 3, 4)])
+
+    backfill = asyncio.create_task(irc_bot._backfill_history(channel))  # type: ignore[arg-type]
+    await asyncio.sleep(0)
+    irc_bot.record_message(make_message(4, "alice", "m4"))
+    irc_bot.record_message(make_message(5, "bob", "m5"))
+    channel.released.set()
+    await backfill
+
+    cached_ids = [message_id for message_id, _ in irc_bot.history_cache[CHANNEL_ID]]
+    assert cached_ids == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_channel_history_ends_at_reference_message(
+    irc_bot: IRCCompletionBot,
+) -> None:
+    """Test that history holds earlier messages followed by the reference."""
+    reference = make_message(3, "carol", "question")
+    for message in (
+        make_message(1, "alice", "hi"),
+        make_message(2, "bob", "-# meta"),
+        reference,
+        make_message(4, "dave", "later"),
+    ):
+        irc_bot.record_message(message)
+    channel = Mock(id=CHANNEL_ID)
+
+    history = await irc_bot.get_channel_history(channel, reference, limit=5)
+
+    assert history == "<alice> hi\n<carol> question\n"
+
+
+@pytest.fixture
+def monitored_bot(irc_bot: IRCCompletionBot) -> IRCCompletionBot:
+    """IRC completion bot monitoring CHANNEL_ID with three cached messages."""
+    irc_bot.monitored_channel_instance = Mock(id=CHANNEL_ID)
+    for message_id, username in ((1, "alice"), (3, "bob"), (5, "carol")):
+        irc_bot.record_message(make_message(message_id, username, f"m{message_id}"))
+    return irc_bot
+
+
+def test_deleted_message_leaves_history(monitored_bot: IRCCompletionBot) -> None:
+    """Test that a deleted message is no longer sent as context."""
+    monitored_bot.handle_message_delete(CHANNEL_ID, {3})
+
+    assert list(monitored_bot.history_cache[CHANNEL_ID]) == [
+        (1, "<alice> m1"),
+        (5, "<carol> m5"),
+    ]
+
+
+def test_bulk_deleted_messages_leave_history(monitored_bot: IRCCompletionBot) -> None:
+    """Test that bulk deletes drop every message, ignoring other channels."""
+    monitored_bot.handle_message_delete(CHANNEL_ID + 1, {1, 3, 5})
+    monitored_bot.handle_message_delete(CHANNEL_ID, {1, 5, 99})
+
+    assert list(monitored_bot.history_cache[CHANNEL_ID]) == [(3, "<bob> m3")]
+
+
+def test_edited_message_is_reformatted(monitored_bot: IRCCompletionBot) -> None:
+    """Test that edits replace, drop or add cached lines in message order."""
+    monitored_bot.handle_message_edit(make_message(3, "bob", "edited"))
+    monitored_bot.handle_message_edit(make_message(5, "carol", "-# hidden now"))
+    monitored_bot.handle_message_edit(make_message(4, "dave", "was hidden"))
+    # Older than anything cached, so it would not have been in the history
+    monitored_bot.handle_message_edit(make_message(0, "erin", "too old"))
+
+    assert list(monitored_bot.history_cache[CHANNEL_ID]) == [
+        (1, "<alice> m1"),
+        (3, "<bob> edited"),
+        (4, "<dave> was hidden"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_status_update_is_retried(irc_bot: IRCCompletionBot) -> None:
+    """Test that a status Discord rejected is sent again when requested."""
+    irc_bot.bot.change_presence = AsyncMock(side_effect=[RuntimeError, None])  # type: ignore[method-assign]
+
+    irc_bot._set_bot_status("alice")
+    assert irc_bot.bot_status_task is not None
+    await irc_bot.bot_status_task
+    irc_bot._set_bot_status("alice")
+    assert irc_bot.bot_status_task is not None
+    await irc_bot.bot_status_task
+
+    assert irc_bot.bot.change_presence.await_count == 2
+    assert irc_bot.shown_bot_status == "alice"